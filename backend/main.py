@@ -3,15 +3,21 @@ from typing import List
 from pathlib import Path
 # Support running as a package (uvicorn backend.main:app) or from within backend/ (uvicorn main:app)
 try:  # Prefer absolute imports when launched from repo root
-    from backend.processing import process_pdf, _get_embedder  # type: ignore
+    from backend.processing import process_pdf, process_pdfs, embed_query_async, lazy_import, _get_embedder, _embedder_tag  # type: ignore
     from backend.vector_store import VectorStore  # type: ignore
+    from backend.semantic_cache import SemanticCache  # type: ignore
+    from backend.persistent_cache import PersistentCache  # type: ignore
 except Exception:  # Fallback to local module imports when cwd is backend/
-    from processing import process_pdf, _get_embedder  # type: ignore
+    from processing import process_pdf, process_pdfs, embed_query_async, lazy_import, _get_embedder, _embedder_tag  # type: ignore
     from vector_store import VectorStore  # type: ignore
+    from semantic_cache import SemanticCache  # type: ignore
+    from persistent_cache import PersistentCache  # type: ignore
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import Optional, Any, Dict, Tuple, Set
+from typing import Optional, Any, Callable, Dict, Iterator, Tuple, Set
 import os
 import json
 import uuid
@@ -22,23 +28,22 @@ import threading
 import time
 import struct
 import mimetypes
+import shutil
+import subprocess
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from collections import OrderedDict
+from functools import lru_cache, partial
 from urllib.parse import urlencode
 import re
+import stat
 import numpy as np  # type: ignore
 from fastapi import HTTPException
 from dotenv import load_dotenv
-try:
-    import google.generativeai as genai
-except ImportError:  # pragma: no cover
-    genai = None  # type: ignore
-try:
-    # New Gemini Speech (google-genai)
-    from google import genai as genai_speech  # type: ignore
-    from google.genai import types as genai_types  # type: ignore
-except Exception:  # pragma: no cover
-    genai_speech = None  # type: ignore
-    genai_types = None  # type: ignore
+# Google SDKs are loaded on first use; see processing.lazy_import
+genai = lazy_import("google.generativeai")
+# New Gemini Speech (google-genai)
+genai_speech = lazy_import("google.genai")
 try:
     import pyttsx3  # type: ignore
 except ImportError:  # pragma: no cover
@@ -47,16 +52,25 @@ try:
     import edge_tts  # type: ignore
 except ImportError:  # pragma: no cover
     edge_tts = None  # type: ignore
-try:
-    # Google Cloud Text-to-Speech
-    from google.cloud import texttospeech as google_tts  # type: ignore
-    import google.oauth2.service_account as gsa  # type: ignore
-except Exception:  # pragma: no cover
-    google_tts = None  # type: ignore
+# Google Cloud Text-to-Speech
+google_tts = lazy_import("google.cloud.texttospeech")
+gsa = lazy_import("google.oauth2.service_account") if google_tts is not None else None
 try:
     import requests  # type: ignore
 except ImportError:  # pragma: no cover
     requests = None  # type: ignore
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+try:
+    import tiktoken  # type: ignore
+except ImportError:  # pragma: no cover
+    tiktoken = None  # type: ignore
+try:
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
 _ENV_PATH = (Path(__file__).resolve().parent / ".env")
 if _ENV_PATH.is_file():
     load_dotenv(dotenv_path=str(_ENV_PATH))
@@ -64,6 +78,15 @@ else:
     # Fallback to default lookup (cwd)
     load_dotenv()
 
+# Settings read on every request path, resolved once now that .env is loaded; the
+# process environment doesn't change while the server runs
+_GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+_GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+_TTS_PROVIDER = (os.getenv("TTS_PROVIDER") or "").lower().strip()
+_HF_TOKEN = os.getenv("HUGGINGFACE_API_TOKEN")
+_HF_DIA_MODEL = os.getenv("HF_DIA_MODEL", "nari-labs/Dia-1.6B")
+_GEMINI_TTS_MODEL = (os.getenv("GEMINI_TTS_MODEL") or "gemini-2.5-flash-preview-tts").strip()
+
 
 def _convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
     """Generates a WAV file header for the given audio data and parameters.
@@ -76,11 +99,19 @@ def _convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
     Returns:
         A bytes object representing the WAV file with proper header.
     """
+    return _wav_header(len(audio_data), mime_type) + audio_data
+
+
+def _wav_header(data_size: int, mime_type: str) -> bytes:
+    """Build the 44-byte PCM WAV header for `data_size` bytes of audio in `mime_type`.
+
+    Lets callers write header and samples separately instead of concatenating
+    them into a second full-size copy of the audio.
+    """
     parameters = _parse_audio_mime_type(mime_type)
     bits_per_sample = parameters["bits_per_sample"]
     sample_rate = parameters["rate"]
     num_channels = 1
-    data_size = len(audio_data)
     bytes_per_sample = bits_per_sample // 8
     block_align = num_channels * bytes_per_sample
     byte_rate = sample_rate * block_align
@@ -103,7 +134,7 @@ def _convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
         b"data",          # Subchunk2ID
         data_size         # Subchunk2Size (size of audio data)
     )
-    return header + audio_data
+    return header
 
 
 def _parse_audio_mime_type(mime_type: str) -> dict:
@@ -140,7 +171,65 @@ def _parse_audio_mime_type(mime_type: str) -> dict:
 
     return {"bits_per_sample": bits_per_sample, "rate": rate}
 
-app = FastAPI(title="Adobe Hackathon Finale API")
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (C encoder, emits bytes directly)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+# Handlers that return this directly skip FastAPI's jsonable_encoder walk over the payload;
+# only use it for content that is already plain JSON types (str/int/float/list/dict).
+_JSONResponseClass = _ORJSONResponse if orjson is not None else JSONResponse
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse a JSON body straight from bytes, skipping the intermediate str decode."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _warm_embedder() -> None:
+    # The first encode pays the SDK import, client setup and (for Gemini) the fallback probe
+    try:
+        _get_embedder().encode(["warmup"], convert_to_numpy=True, normalize_embeddings=True)
+    except Exception:
+        pass
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Runs once per process (and once per `with TestClient(app)` block), not per request
+    global _http_client
+    # Sync (def) endpoints and blocking I/O (upload copies, digests, HTTP fallbacks, batch
+    # polling) run on AnyIO's worker threads, 40 by default; CPU-bound PDF work stays on
+    # _bg_executor. Raise the cap so slow I/O doesn't queue up behind itself.
+    raw_limit = os.getenv("FASTAPI_THREAD_LIMIT", "128")
+    try:
+        import anyio.to_thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = int(raw_limit)
+    except Exception as e:
+        print(f"[startup] could not set the worker thread limit to {raw_limit!r}: {e}")
+    await _startup_index_existing_pdfs()
+    # Loaded in the background: it may download the encoding file, and truncation uses
+    # the character estimate until it is ready
+    asyncio.get_running_loop().run_in_executor(_bg_executor, _load_token_encoding)
+    if os.getenv("WARM_EMBEDDER", "1") == "1":
+        # Warm in the background: the server starts accepting requests right away, and the
+        # first /recommendations or /insights call no longer pays the embedder cold start
+        asyncio.get_running_loop().run_in_executor(_bg_executor, _warm_embedder)
+    yield
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+app = FastAPI(
+    title="Adobe Hackathon Finale API",
+    default_response_class=_JSONResponseClass,
+    lifespan=_lifespan,
+)
 
 # Global in-memory vector store for this app instance
 store = VectorStore()
@@ -156,12 +245,42 @@ CROSS_INSIGHTS_DEEP = (os.getenv("CROSS_INSIGHTS_DEEP", "true") or "true").strip
 # ---------------------------------------------------------------------------
 # Performance / caching infrastructure
 # ---------------------------------------------------------------------------
-# Lightweight in-memory caches (non-persistent) to avoid recomputation during a
-# single server session. For hackathon/demo scale this is sufficient; for
-# production consider an external cache with TTL handling.
-_script_cache: Dict[str, str] = {}
-_audio_cache: Dict[str, Tuple[str, str]] = {}  # key -> (filename, rel_url)
+# Query-level cache for /recommendations: exact text match first, then near-duplicate
+# queries by embedding cosine similarity (skips the vector search entirely on a hit).
+# Persisted to SQLite so it survives restarts; set SEMCACHE_PATH="" to keep it in memory only.
+_cache_dir = (Path(__file__).resolve().parent / "cache").absolute()
+_semcache_path = os.getenv("SEMCACHE_PATH")
+if _semcache_path is None:
+    _cache_dir.mkdir(parents=True, exist_ok=True)
+    _semcache_path = str(_cache_dir / "semantic_cache.db")
+_reco_cache = SemanticCache(
+    threshold=float(os.getenv("SEMCACHE_TAU", "0.95")),
+    max_entries=int(os.getenv("SEMCACHE_SIZE", "1024")),
+    path=_semcache_path or None,
+)
+# Same two-tier cache for the /insights citation lookup (in memory only: entries are
+# cheap to rebuild and only save the embed + search, not the Gemini call)
+_citations_cache = SemanticCache(
+    threshold=float(os.getenv("SEMCACHE_TAU", "0.95")),
+    max_entries=int(os.getenv("SEMCACHE_SIZE", "1024")),
+)
 
+# Script/audio and cross-document caches save Gemini and TTS calls, so they are written
+# through to SQLite (one table each) and survive restarts. Keys already embed content
+# hashes / file signatures; the TTLs only bound staleness. CACHE_DB_PATH="" keeps them
+# in memory only.
+_cache_db_path = os.getenv("CACHE_DB_PATH")
+if _cache_db_path is None:
+    _cache_dir.mkdir(parents=True, exist_ok=True)
+    _cache_db_path = str(_cache_dir / "app_cache.db")
+_DAY_S = 24 * 3600
+_script_cache = PersistentCache(_cache_db_path or None, "scripts", ttl=30 * _DAY_S)  # key -> (script, _hash_short(script))
+_script_inflight: Dict[Tuple[Any, ...], "asyncio.Future[str]"] = {}  # script key -> pending _gemini_script
+_audio_cache = PersistentCache(_cache_db_path or None, "audio", ttl=30 * _DAY_S)  # key -> (filename, rel_url)
+_audio_inflight: Dict[Tuple[Any, ...], "asyncio.Future[Dict[str, Any]]"] = {}  # audio key -> pending _render_audio
+
+_http_client: Optional[Any] = None  # shared httpx.AsyncClient, created on first use
+_gemini_sem: Optional[asyncio.Semaphore] = None  # caps concurrent async Gemini calls, created on first use
 _pyttsx3_lock = threading.Lock()  # pyttsx3 is not fully thread-safe
 _tts_executor = ThreadPoolExecutor(max_workers=int(os.getenv("TTS_WORKERS", "2")))
 _bg_executor = ThreadPoolExecutor(max_workers=int(os.getenv("BG_WORKERS", "4")))
@@ -171,13 +290,35 @@ def _hash_short(value: str) -> str:
     return hashlib.sha1(value.encode("utf-8")).hexdigest()[:16]
 
 
+_AUDIO_EXTS = ("wav", "mp3", "ogg")  # in order of preference when a stem exists in several formats
+_audio_files: Dict[str, str] = {}  # stem -> filename of synthesized audio in _audio_dir
+
+
+def _index_audio(name: str) -> None:
+    """Record a file written to _audio_dir so cache lookups don't have to stat the disk."""
+    stem, _, ext = name.rpartition(".")
+    if ext not in _AUDIO_EXTS:
+        return
+    current = _audio_files.get(stem)
+    if current is None or _AUDIO_EXTS.index(ext) <= _AUDIO_EXTS.index(current.rpartition(".")[2]):
+        _audio_files[stem] = name
+
+
+def _existing_audio(stem: str) -> Optional[Tuple[str, str]]:
+    """(filename, rel_url) of a previously synthesized `stem.{wav,mp3,ogg}`, if any."""
+    name = _audio_files.get(stem)
+    if name is None:
+        return None
+    return name, f"/audio/{name}"
+
+
 def _synthesize_with_fallback(text: str, base: str, voice: Optional[str], accent: Optional[str], style: Optional[str]) -> Tuple[str, str]:
     """Try TTS providers based on env preference.
     If a specific provider is set via TTS_PROVIDER, use ONLY that provider (no silent fallback).
     If not set, try a sensible fallback order.
     """
     # Choose order based on env preference
-    pref = (os.getenv("TTS_PROVIDER") or "").strip().lower()
+    pref = _TTS_PROVIDER
     recognized = {"edge_tts", "hf_dia", "pyttsx3", "google", "gemini"}
     order: List[str]
     if pref in recognized and pref != "":
@@ -200,19 +341,33 @@ def _synthesize_with_fallback(text: str, base: str, voice: Optional[str], accent
     return _synthesize_speech(text, voice=voice, accent=accent, style=style, deterministic_basename=base, provider_override="pyttsx3")
 
 # Cross-document analysis caches
-_doc_claims_cache: Dict[str, List[Dict[str, Any]] ] = {}
-_cross_insights_cache: Dict[str, Dict[str, Any]] = {}
-_web_cache: Dict[str, List[Dict[str, Any]]] = {}
+_doc_claims_cache = PersistentCache(_cache_db_path or None, "doc_claims", ttl=7 * _DAY_S)
+_cross_insights_cache = PersistentCache(_cache_db_path or None, "cross_insights", ttl=7 * _DAY_S)
+# Web search results go stale quickly: bounded, short-lived and memory-only
+_web_cache = PersistentCache(None, "web", ttl=15 * 60, max_entries=1024)  # key -> [{title, url, snippet}]
+_indexed_digests: Dict[str, str] = {}  # filename -> content hash of the version in the store
+
+def _file_signature(filename: str, st: Optional[os.stat_result] = None) -> str:
+    """Return a short signature for a file based on mtime and size for cache invalidation.
 
-def _file_signature(filename: str) -> str:
-    """Return a short signature for a file based on mtime and size for cache invalidation."""
+    Pass `st` when the caller already has the file's stat (e.g. from a directory scan).
+    """
     try:
-        p = (_docs_dir / filename)
-        st = p.stat()
+        if st is None:
+            st = os.stat(os.path.join(_docs_dir_str, filename))
         return f"{filename}:{int(st.st_mtime)}:{st.st_size}"
     except Exception:
         return f"{filename}:na"
 
+def _pdf_entries() -> List[os.DirEntry]:
+    """PDFs in the document library, sorted by name, from a single directory scan.
+
+    DirEntry caches the file type from the scan, so filtering costs no per-file stat and
+    callers that need sizes/mtimes can reuse entry.stat().
+    """
+    with os.scandir(_docs_dir_str) as it:
+        return sorted((e for e in it if e.is_file() and e.name.lower().endswith(".pdf")), key=lambda e: e.name)
+
 # CORS for frontend - allow both local dev and production
 # Get allowed origins from environment or use defaults
 allowed_origins = os.getenv("CORS_ORIGINS", "").split(",") if os.getenv("CORS_ORIGINS") else [
@@ -235,11 +390,24 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
     expose_headers=["*"],
+    # Let browsers cache preflight results so POST+JSON calls skip the extra OPTIONS round trip
+    max_age=int(os.getenv("CORS_MAX_AGE", "86400")),
 )
 
 # Serve uploaded PDFs statically so the frontend can preview them
 _docs_dir = (Path(__file__).resolve().parent / "document_library").absolute()
 _docs_dir.mkdir(parents=True, exist_ok=True)
+_docs_dir_str = str(_docs_dir)
+# Names that would escape document_library (separators, NUL, "." / ".."); uploads only
+# ever store a bare name component, so anything matching cannot be a library file
+_UNSAFE_FILENAME_RE = re.compile(r"[\\/\x00]|^\.{1,2}$")
+
+
+def _doc_path(filename: str) -> str:
+    """Absolute path of a library PDF from a request filename (plain string ops, no Path objects)."""
+    if not filename or _UNSAFE_FILENAME_RE.search(filename):
+        raise HTTPException(status_code=404, detail="File not found")
+    return os.path.join(_docs_dir_str, filename)
 app.mount(
     "/document_library",
     StaticFiles(directory=str(_docs_dir)),
@@ -249,6 +417,12 @@ app.mount(
 # Serve generated audio files
 _audio_dir = (Path(__file__).resolve().parent / "generated_audio").absolute()
 _audio_dir.mkdir(parents=True, exist_ok=True)
+# One directory scan at startup; everything synthesized afterwards is added by _index_audio
+with os.scandir(_audio_dir) as _entries:
+    for _entry in _entries:
+        # d_type from readdir: no stat per file (symlinks are not followed)
+        if _entry.is_file(follow_symlinks=False):
+            _index_audio(_entry.name)
 app.mount(
     "/audio",
     StaticFiles(directory=str(_audio_dir)),
@@ -259,29 +433,62 @@ app.mount(
 # ---------------------------------------------------------------------------
 # Startup: index any PDFs already present so recommendations work after restart
 # ---------------------------------------------------------------------------
-@app.on_event("startup")
-async def _startup_index_existing_pdfs():
+def _file_digest(path: str) -> str:
+    """Content hash of a file, read in 1 MiB blocks (same hash process_pdf keys its cache on)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(partial(f.read, 1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _library_fingerprint() -> str:
+    """Short hash over every indexed file's content digest; changes whenever a PDF is added
+    or replaced, even by one with the same number of chunks."""
+    return _hash_short("|".join(f"{name}:{digest}" for name, digest in sorted(_indexed_digests.items())))
+
+
+def _record_indexed_digests(names: List[str]) -> None:
+    """Remember the content hash of files just added to the store (see /process)."""
+    for name in names:
+        try:
+            _indexed_digests[name] = _file_digest(os.path.join(_docs_dir_str, name))
+        except OSError:
+            continue
+
+
+def _add_to_store(batches: List[Tuple[str, List[Dict[str, Any]]]]) -> List[str]:
+    """Add several parsed PDFs to the store in one bulk insert; returns the filenames added.
+
+    If the bulk insert fails (e.g. one file's embeddings don't match the index dimension),
+    falls back to adding files one by one and skipping the problematic ones.
+    """
+    batches = [(name, processed) for name, processed in batches if processed]
     try:
-        # Collect already-indexed filenames from metadata
-        indexed: Set[str] = set()
-        for md in store.metadatas:
-            fn = md.get("filename")
-            if fn:
-                indexed.add(fn)
-        # Scan disk for PDFs
-        to_add: List[Path] = []
-        for p in _docs_dir.iterdir():
-            if p.is_file() and p.suffix.lower() == ".pdf" and p.name not in indexed:
-                to_add.append(p)
-        # Process sequentially to avoid embedder concurrency issues
-        for pdf_path in sorted(to_add):
+        store.add_many(batches)
+        return [name for name, _ in batches]
+    except Exception:
+        added: List[str] = []
+        for name, processed in batches:
             try:
-                processed = process_pdf(str(pdf_path))
-                if processed:
-                    store.add_documents(processed, filename=pdf_path.name)
+                store.add_documents(processed, filename=name)
+                added.append(name)
             except Exception:
-                # Skip problematic files to keep startup resilient
                 continue
+        return added
+
+
+async def _startup_index_existing_pdfs():
+    try:
+        # Collect already-indexed filenames from the store's file index
+        indexed: Set[str] = store.indexed_files()
+        # Scan disk for PDFs
+        to_add = [e for e in _pdf_entries() if e.name not in indexed]
+        # Parse all files, then embed every new chunk in one batched provider call
+        loop = asyncio.get_running_loop()
+        batches = await loop.run_in_executor(_bg_executor, process_pdfs, [e.path for e in to_add])
+        added = _add_to_store([(entry.name, processed) for entry, processed in zip(to_add, batches)])
+        await loop.run_in_executor(_bg_executor, _record_indexed_digests, added)
     except Exception:
         # Never block server startup on indexing failures
         pass
@@ -294,42 +501,45 @@ async def reindex():
     """
     newly: List[str] = []
     try:
-        indexed: Set[str] = set()
-        for md in store.metadatas:
-            fn = md.get("filename")
-            if fn:
-                indexed.add(fn)
-        for p in _docs_dir.iterdir():
-            if p.is_file() and p.suffix.lower() == ".pdf" and p.name not in indexed:
-                try:
-                    processed = process_pdf(str(p))
-                    if processed:
-                        store.add_documents(processed, filename=p.name)
-                        newly.append(p.name)
-                except Exception:
-                    continue
+        indexed: Set[str] = store.indexed_files()
+        to_add = [e for e in _pdf_entries() if e.name not in indexed]
+        # PDF parsing + embedding is blocking; keep the event loop free and batch the embed call
+        loop = asyncio.get_running_loop()
+        all_processed = await loop.run_in_executor(_bg_executor, process_pdfs, [e.path for e in to_add])
+        newly = _add_to_store([(entry.name, processed) for entry, processed in zip(to_add, all_processed)])
+        await loop.run_in_executor(_bg_executor, _record_indexed_digests, newly)
     except Exception:
         pass
     return {"indexed": newly}
 
 
+@lru_cache(maxsize=1)
+def _public_settings() -> bytes:
+    """Read and serialize the public (frontend-safe) settings once; env is fixed after load_dotenv."""
+    return json.dumps({
+        "adobeClientId": os.getenv("ADOBE_CLIENT_ID", "")
+    }, separators=(",", ":")).encode("utf-8")
+
+
 @app.get("/config/public")
-def public_config():
+async def public_config():
     """Return non-sensitive config usable by the frontend."""
-    return {
-        "adobeClientId": os.getenv("ADOBE_CLIENT_ID", "")
-    }
+    return Response(content=_public_settings(), media_type="application/json")
+
+
+# Static payload, serialized once: health checks hit this every few seconds
+_HEALTH_BYTES = json.dumps({"status": "ok"}, separators=(",", ":")).encode("utf-8")
 
 
 @app.get("/v1/health")
-def health_check():
-    return {"status": "ok"}
+async def health_check():
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 @app.get("/diagnostics")
 def diagnostics():
     """Basic diagnostics for TTS provider configuration and audio tools."""
-    provider = (os.getenv("TTS_PROVIDER") or "auto").lower().strip() or "auto"
+    provider = _TTS_PROVIDER or "auto"
     info: Dict[str, Any] = {"provider": provider, "ffmpeg": False, "ffprobe": False}
     # Check ffmpeg / ffprobe
     try:
@@ -367,13 +577,13 @@ def diagnostics():
                     "error": str(e)[:300]
                 })
     elif provider == "hf_dia":
-        info["hf_dia"] = {"token": bool(os.getenv("HUGGINGFACE_API_TOKEN"))}
+        info["hf_dia"] = {"token": bool(_HF_TOKEN)}
     elif provider == "gemini":
         ok = False
         err = None
         try:
             if genai_speech is not None:
-                _ = genai_speech.Client(api_key=(os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY") or ""))
+                _ = genai_speech.Client(api_key=(_GEMINI_API_KEY or _GOOGLE_API_KEY or ""))
                 ok = True
         except Exception as e:  # pragma: no cover
             err = str(e)[:300]
@@ -388,16 +598,17 @@ def diagnostics():
 def list_documents():
     """List uploaded PDF filenames in the document library."""
     try:
-        files = []
-        for p in _docs_dir.iterdir():
-            if p.is_file() and p.suffix.lower() == ".pdf":
-                files.append(p.name)
-        files.sort()
-        return {"files": files}
+        return {"files": [e.name for e in _pdf_entries()]}
     except Exception as e:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"Failed to list documents: {e}")
 
 
+# Snippet shaping runs once per recommendation result; compile its patterns once
+_WS_RE = re.compile(r"\s+")
+_SENT_RE = re.compile(r"(?<=[.!?])\s+")
+_TOK_RE = re.compile(r"[A-Za-z0-9]+")
+
+
 class RecommendationRequest(BaseModel):
     text: Optional[str] = None
     filename: Optional[str] = None
@@ -415,34 +626,37 @@ async def recommendations(req: RecommendationRequest):
     if req.text and req.text.strip():
         query_text = req.text.strip()
     elif req.filename:
-        # Aggregate chunks for the given page or entire file
-        joined: List[str] = []
-        for text, meta in zip(store.texts, store.metadatas):
-            if meta.get("filename") == req.filename and (
-                req.page_number is None or meta.get("page_number") == req.page_number
-            ):
-                joined.append(text)
-        if joined:
-            # Use a brief summary as query to avoid excessively long input
-            query_text = "\n\n".join(joined)[:2000]
+        # Aggregate chunks for the given page or entire file (cached per page in the store);
+        # truncated to a brief summary to avoid excessively long input
+        query_text = store.get_page_text(req.filename, req.page_number, max_chars=2000) or None
 
     if not query_text:
-        return {"results": []}
+        return _JSONResponseClass({"results": []})
 
-    # Embed and search
-    model = _get_embedder()
-    q_emb = model.encode([query_text], convert_to_numpy=True, normalize_embeddings=True)[0]
     # Expand initial pool to ensure we can dedupe and find distinct sections
     fetch_k = req.fetch_k if req.fetch_k is not None else max(req.k * 3, req.k + 10)
-    results = store.search(q_emb, k=req.k, fetch_k=fetch_k)
+    # Everything besides the query that shapes the response; the library fingerprint
+    # invalidates on new or replaced uploads, and the embedder tag keeps persisted vectors
+    # from one embedding space from being compared against queries embedded in another
+    cache_scope = (_embedder_tag(), _library_fingerprint(), req.k, fetch_k, req.min_score, req.filename, req.page_number, req.exclude_self)
+    cached = _reco_cache.get_exact(query_text, cache_scope)
+    if cached is not None:
+        return _JSONResponseClass({"results": cached})
+
+    # Embed (memoized per query text) and search
+    q_emb = await embed_query_async(query_text)
+    cached = _reco_cache.get(q_emb, cache_scope)
+    if cached is not None:
+        return _JSONResponseClass({"results": cached})
+    row_ids, scores = store.search_ids(q_emb, k=req.k, fetch_k=fetch_k)
 
     # Helper: produce a 2–4 sentence extract from the best available source text
     def _snippet_2to4_sentences(source_text: str, meta: Dict[str, Any], query: str) -> str:
         def split_sentences(t: str) -> List[str]:
-            t = re.sub(r"\s+", " ", t or "").strip()
+            t = _WS_RE.sub(" ", t or "").strip()
             if not t:
                 return []
-            parts = re.split(r"(?<=[.!?])\s+", t)
+            parts = _SENT_RE.split(t)
             # Trim and drop empties
             return [p.strip() for p in parts if p and len(p.strip()) > 0]
 
@@ -453,7 +667,7 @@ async def recommendations(req: RecommendationRequest):
             pnum = meta.get("page_number")
             if fname and pnum:
                 try:
-                    text = _extract_page_text(str((_docs_dir / fname).absolute()), int(pnum))
+                    text = _extract_page_text(_doc_path(fname), int(pnum))
                 except Exception:
                     text = ""
         sents = split_sentences(text)
@@ -463,19 +677,18 @@ async def recommendations(req: RecommendationRequest):
             return " ".join(sents)
 
         # Score sentences by query term overlap
-        tokens = [w.lower() for w in re.findall(r"[A-Za-z0-9]+", query or "") if len(w) >= 3]
-        uniq = list(dict.fromkeys(tokens))[:12]
-        scores = []
-        for i, sent in enumerate(sents):
-            l = sent.lower()
-            score = sum(1 for w in uniq if w in l)
-            scores.append((score, i))
+        tokens = [w.lower() for w in _TOK_RE.findall(query or "") if len(w) >= 3]
+        uniq = frozenset(list(dict.fromkeys(tokens))[:12])
+        scores = [len(uniq.intersection(_TOK_RE.findall(sent.lower()))) for sent in sents]
         # Choose best 3-sentence window; allow 2 or 4 if at edges or ties
         best = (-(10**9), 0, 3)  # (score, start, window)
         n = len(sents)
         for win in (3, 4, 2):
+            sc = sum(scores[:win])
             for start in range(0, n - win + 1):
-                sc = sum(scores[i][0] for i in range(start, start + win))
+                if start:
+                    # Slide the window: O(1) per step instead of re-summing it
+                    sc += scores[start + win - 1] - scores[start - 1]
                 cand = (sc, start, win)
                 if cand > best:
                     best = cand
@@ -489,52 +702,58 @@ async def recommendations(req: RecommendationRequest):
             snippet = snippet[:600].rsplit(" ", 1)[0] + " …"
         return snippet
 
-    # De-dup and optional filtering
+    # De-dup and optional filtering, as masks over the store's metadata columns.
     # De-dup by section when available (filename + section_index), else by page
-    seen: Set[Tuple[Optional[str], Optional[int], Optional[int]]] = set()
+    file_ids = store.file_ids[row_ids]
+    pages = store.page_numbers[row_ids]
+    keep = np.ones(row_ids.shape[0], dtype=bool)
+    best_self: Optional[int] = None  # hold best result from the same page if we end up empty
+    if req.exclude_self and req.filename and req.page_number:
+        self_code = store.file_code(req.filename)
+        if self_code >= 0:
+            is_self = (file_ids == self_code) & (pages == req.page_number)
+            if is_self.any():
+                # Record the best self result in case everything else is filtered out
+                best_self = int(np.argmax(is_self))
+            keep &= ~is_self
+    if req.min_score is not None:
+        keep &= scores >= req.min_score
+    cand = np.flatnonzero(keep)
+    if cand.size:
+        # return_index gives each key's first (i.e. best-ranked) occurrence
+        _, first = np.unique(store.section_keys(row_ids[cand]), return_index=True)
+        cand = cand[np.sort(first)][: req.k]
+
     shaped = []
-    best_self = None  # hold best result from the same page if we end up empty
-    for r in results:
-        md = r.get("metadata", {})
-        fname = md.get("filename")
-        pnum = md.get("page_number")
-        sec_idx = md.get("section_index")
-        key = (fname, sec_idx, pnum)
-        if key in seen:
-            continue
-        if req.exclude_self and req.filename and fname == req.filename and req.page_number and pnum == req.page_number:
-            # Record the best self result in case everything else is filtered out
-            if best_self is None:
-                best_self = r
-            continue
-        score = r.get("score")
-        if req.min_score is not None and score is not None and score < req.min_score:
-            continue
-        seen.add(key)
-        source_text = r.get("text", "")
-        cleaned = _snippet_2to4_sentences(source_text, md, query_text or "")
+    # Gather the kept rows' columns with one fancy-index each, as plain Python scalars
+    sel = row_ids[cand]
+    for i, score, page, sec in zip(
+        sel.tolist(), scores[cand].tolist(), store.page_numbers[sel].tolist(), store.section_ids[sel].tolist()
+    ):
+        md = store.metadatas[i]
+        cleaned = _snippet_2to4_sentences(store.texts[i], md, query_text or "")
         shaped.append({
             "snippet": cleaned,
-            "filename": fname,
-            "page_number": pnum,
+            "filename": store.filename_at(i),
+            "page_number": page,
             "section_title": md.get("section_title"),
-            "section_index": md.get("section_index"),
-            "distance": r.get("distance"),
+            "section_index": sec if sec >= 0 else None,
+            "distance": 1.0 - score,
             "score": score,
         })
-        if len(shaped) >= req.k:
-            break
     # If nothing found and we filtered out the self page, return the best self match
     if not shaped and best_self is not None:
-        md = best_self.get("metadata", {})
+        i = int(row_ids[best_self])
+        score = float(scores[best_self])
         shaped.append({
-            "snippet": best_self.get("text", ""),
-            "filename": md.get("filename"),
-            "page_number": md.get("page_number"),
-            "distance": best_self.get("distance"),
-            "score": best_self.get("score"),
+            "snippet": store.texts[i],
+            "filename": store.filename_at(i),
+            "page_number": int(store.page_numbers[i]),
+            "distance": 1.0 - score,
+            "score": score,
         })
-    return {"results": shaped}
+    _reco_cache.put(query_text, q_emb, cache_scope, shaped)
+    return _JSONResponseClass({"results": shaped})
 
 
 class InsightsRequest(BaseModel):
@@ -546,53 +765,267 @@ class InsightsRequest(BaseModel):
     web_k: int = 3  # number of web sources when web=True
 
 
+# Open fitz.Documents keyed by (path, mtime): repeated page reads on the same PDF skip
+# re-parsing the xref table/catalog. A Document is not thread-safe, so each carries a lock.
+_PDF_DOCS: "OrderedDict[Tuple[str, float], Tuple[Any, threading.Lock]]" = OrderedDict()
+_PDF_DOCS_LOCK = threading.Lock()
+_PDF_DOCS_MAX = int(os.getenv("PDF_DOC_CACHE_SIZE", "32"))
+# Extracted text keyed by (path, _file_signature, page_number); page None is the whole
+# document. Snippet fallbacks and /insights hit the same pages over and over.
+_PDF_TEXTS: "OrderedDict[Tuple[str, str, Optional[int]], str]" = OrderedDict()
+_PDF_TEXTS_MAX = int(os.getenv("PDF_TEXT_CACHE_SIZE", "4096"))
+
+
+def _close_docs(entries: List[Tuple[Any, threading.Lock]]) -> None:
+    for doc, lock in entries:
+        with lock:
+            try:
+                doc.close()
+            except Exception:
+                pass
+
+
+def _forget_pdf(file_path: str) -> None:
+    """Close and drop cached Documents for a path (e.g. before it is overwritten)."""
+    with _PDF_DOCS_LOCK:
+        stale = [k for k in _PDF_DOCS if k[0] == file_path]
+        entries = [_PDF_DOCS.pop(k) for k in stale]
+        for k in [k for k in _PDF_TEXTS if k[0] == file_path]:
+            del _PDF_TEXTS[k]
+    _close_docs(entries)
+
+
+def _cached_pdf_text(file_path: str, page_number: Optional[int], extract: Callable[[Any], str]) -> str:
+    """Return extract(doc) for file_path, memoized until the file's mtime/size change."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="File not found")
+    key = (file_path, _file_signature(os.path.basename(file_path), st), page_number)
+    with _PDF_DOCS_LOCK:
+        text = _PDF_TEXTS.get(key)
+        if text is not None:
+            _PDF_TEXTS.move_to_end(key)
+            return text
+    with _open_pdf(file_path) as doc:
+        text = extract(doc)
+    with _PDF_DOCS_LOCK:
+        _PDF_TEXTS[key] = text
+        while len(_PDF_TEXTS) > _PDF_TEXTS_MAX:
+            _PDF_TEXTS.popitem(last=False)
+    return text
+
+
+@contextmanager
+def _open_pdf(file_path: str) -> Iterator[Any]:
+    """Yield a cached fitz.Document for file_path; reopened when the file's mtime changes."""
+    key = (file_path, os.path.getmtime(file_path))
+    evicted: List[Tuple[Any, threading.Lock]] = []
+    with _PDF_DOCS_LOCK:
+        entry = _PDF_DOCS.get(key)
+        if entry is not None:
+            _PDF_DOCS.move_to_end(key)
+    if entry is None:
+        # Parse the xref outside the global lock so a large PDF doesn't stall other
+        # lookups; filetype skips content sniffing
+        fresh = (fitz.open(file_path, filetype="pdf"), threading.Lock())
+        with _PDF_DOCS_LOCK:
+            entry = _PDF_DOCS.get(key)
+            if entry is None:
+                # An older version of the same file can never be hit again
+                evicted = [_PDF_DOCS.pop(k) for k in [k for k in _PDF_DOCS if k[0] == file_path]]
+                entry = fresh
+                _PDF_DOCS[key] = entry
+                while len(_PDF_DOCS) > _PDF_DOCS_MAX:
+                    evicted.append(_PDF_DOCS.popitem(last=False)[1])
+            else:
+                # Another thread opened it first; keep theirs
+                evicted = [fresh]
+    _close_docs(evicted)
+    doc, lock = entry
+    with lock:
+        yield doc
+
+
 def _extract_entire_pdf_text(file_path: str) -> str:
     """Extract text from entire PDF for podcast generation."""
-    if not Path(file_path).is_file():
-        raise HTTPException(status_code=404, detail="File not found")
+    def extract(doc: Any) -> str:
+        if doc.needs_pass:
+            return ""  # encrypted: no page yields text without the password
+        # Collect and join once; += is quadratic on book-length PDFs
+        parts: List[str] = []
+        for page_num in range(len(doc)):
+            page = doc.load_page(page_num)
+            page_text = page.get_text("text", flags=fitz.TEXTFLAGS_TEXT) or ""
+            if page_text.strip():
+                parts.append(f"\n\nPage {page_num + 1}:\n{page_text}")
+        return "".join(parts)
+
     try:
-        doc = fitz.open(file_path)
-        try:
-            full_text = ""
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_text = page.get_text("text") or ""
-                if page_text.strip():
-                    full_text += f"\n\nPage {page_num + 1}:\n{page_text}"
-            return full_text
-        finally:
-            doc.close()
+        return _cached_pdf_text(file_path, None, extract)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read PDF: {e}")
 
 
 def _extract_page_text(file_path: str, page_number: int) -> str:
-    if not Path(file_path).is_file():
-        raise HTTPException(status_code=404, detail="File not found")
     if page_number is None or page_number < 1:
         raise HTTPException(status_code=400, detail="page_number must be >= 1")
+
+    def extract(doc: Any) -> str:
+        idx = page_number - 1
+        if idx >= len(doc):
+            raise HTTPException(status_code=400, detail="page_number out of range")
+        return doc.load_page(idx).get_text("text") or ""
+
     try:
-        doc = fitz.open(file_path)
-        try:
-            idx = page_number - 1
-            if idx < 0 or idx >= len(doc):
-                raise HTTPException(status_code=400, detail="page_number out of range")
-            page = doc[idx]
-            return page.get_text("text") or ""
-        finally:
-            doc.close()
+        return _cached_pdf_text(file_path, page_number, extract)
     except HTTPException:
         raise
     except Exception as e:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"Failed to read PDF: {e}")
 
 
-def _gemini_insights(text: str, citations: Optional[List[Dict[str, Any]]] = None, web_results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+# generation_config per call site; None means the model defaults
+_GEMINI_MODEL_CONFIGS: Dict[str, Optional[Dict[str, Any]]] = {
+    "insights": {"response_mime_type": "application/json", "temperature": 0.8, "top_p": 0.95},
+    "json": {"response_mime_type": "application/json"},
+    "script": {"response_mime_type": "text/plain"},
+    "text": None,
+}
+
+
+@lru_cache(maxsize=16)
+def _gemini_model(api_key: Optional[str], kind: str) -> Any:
+    """Configure genai and build the GenerativeModel once per (key, config), not per request.
+
+    The model keeps its API client after the first call, so reusing it also reuses the
+    underlying transport.
+    """
+    genai.configure(api_key=api_key)
+    config = _GEMINI_MODEL_CONFIGS[kind]
+    if config is None:
+        return genai.GenerativeModel(model_name="gemini-2.5-flash")
+    return genai.GenerativeModel(model_name="gemini-2.5-flash", generation_config=config)
+
+
+@lru_cache(maxsize=4)
+def _genai_client(api_key: str) -> Any:
+    """google.genai Client (speech synthesis, batch jobs) shared per API key.
+
+    Building one sets up auth and an HTTP transport; reusing it keeps connections warm
+    across TTS segments and podcast parts.
+    """
+    return genai_speech.Client(api_key=api_key)
+
+
+def _normalize_insights(data: Any) -> Dict[str, List[str]]:
+    """Map a parsed Gemini insights payload onto the fixed /insights categories."""
+    result: Dict[str, List[str]] = {
+        "key_insights": [],
+        "did_you_know_facts": [],
+        "counterpoints": [],
+        "inspirations": [],
+        "examples": [],
+    }
+    if isinstance(data, dict):
+        # Map various possible key names to our expected format
+        key_mappings = {
+            "key_insights": ["key_insights", "keyInsights", "insights", "main_insights"],
+            "did_you_know_facts": ["did_you_know_facts", "didYouKnowFacts", "facts", "interesting_facts"],
+            "examples": ["examples", "Examples"],
+            "counterpoints": ["counterpoints", "Counterpoints", "limitations", "caveats"],
+            "inspirations": ["inspirations", "Inspirations", "ideas", "applications"],
+        }
+        for target_key, possible_keys in key_mappings.items():
+            for key in possible_keys:
+                if key in data and isinstance(data[key], list):
+                    result[target_key] = [str(item) for item in data[key] if item]
+                    break
+    return result
+
+
+# cl100k_base tokenizer, set by _load_token_encoding at startup. The first get_encoding
+# call may download the BPE file, so it never runs on the request path.
+_token_encoding: Any = None
+
+
+def _load_token_encoding() -> None:
+    global _token_encoding
+    if tiktoken is None or _token_encoding is not None:
+        return
+    try:
+        _token_encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"[tokens] cl100k_base unavailable ({type(e).__name__}), estimating ~4 chars per token")
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to at most `max_tokens` tokens, ending on a paragraph or sentence boundary.
+
+    Tokenizes once and slices the ids; until the tokenizer is loaded (or without tiktoken),
+    falls back to ~4 chars per token.
+    """
+    enc = _token_encoding
+    if enc is None:
+        if len(text) <= max_tokens * 4:
+            return text
+        head = text[: max_tokens * 4]
+    else:
+        ids = enc.encode(text, disallowed_special=())
+        if len(ids) <= max_tokens:
+            return text
+        head = enc.decode(ids[:max_tokens])
+    # Prefer the last paragraph break, then sentence end, as long as it keeps half the budget
+    for sep, keep in (("\n\n", 0), (". ", 1), ("\n", 0)):
+        cut = head.rfind(sep)
+        if cut >= len(head) // 2:
+            return head[: cut + keep].rstrip()
+    cut = head.rfind(" ")
+    return (head[:cut] if cut > 0 else head).rstrip()
+
+
+_INSIGHTS_TEXT_TOKENS = 500  # budget for the main text in insights prompts
+
+
+def _insights_prompt(text: str, citations: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Build the /insights prompt (shared by the interactive call and the batch prefetch)."""
+    # Build context from citations
+    context_parts = [f"MAIN TEXT:\n{_truncate_to_tokens(text, _INSIGHTS_TEXT_TOKENS)}"]
+    
+    if citations:
+        cite_text = "\n\nRELATED DOCUMENTS:\n"
+        for i, c in enumerate(citations[:3]):
+            cite_text += f"{i+1}. From {c.get('filename', 'unknown')} (page {c.get('page_number', '?')}): {_truncate_to_tokens(c.get('snippet', ''), 75)}\n"
+        context_parts.append(cite_text)
+    
+    full_context = "\n".join(context_parts)
+    
+    # Use a simpler, more direct prompt without JSON mode first
+    prompt = f"""Analyze this text and provide insights in the following categories:
+
+{full_context}
+
+Please provide:
+1. KEY INSIGHTS (3-5 main takeaways)
+2. DID YOU KNOW FACTS (2-4 interesting facts)
+3. EXAMPLES (2-3 concrete examples that illustrate the concepts)
+4. COUNTERPOINTS (1-2 alternative perspectives or limitations, if any)
+5. INSPIRATIONS (1-2 actionable ideas or applications)
+6. NARRATION: rewrite the MAIN TEXT into a concise, natural narration (15-60 seconds). Conversational tone, no lists, no URLs.
+
+Format your response as valid JSON with these exact keys: "key_insights", "did_you_know_facts", "examples", "counterpoints", "inspirations", "narration"
+Each value except "narration" should be an array of strings; "narration" is a single string. Be specific and concrete."""
+    return prompt
+
+
+async def _gemini_insights(text: str, citations: Optional[List[Dict[str, Any]]] = None, web_results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Generate insights from text using Gemini API with robust error handling and fallback."""
     if genai is None:
         raise HTTPException(status_code=500, detail="google-generativeai not installed on server")
     
-    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+    api_key = _GOOGLE_API_KEY or _GEMINI_API_KEY
     if not api_key:
         raise HTTPException(status_code=503, detail="GOOGLE_API_KEY or GEMINI_API_KEY not configured on server")
     
@@ -604,46 +1037,14 @@ def _gemini_insights(text: str, citations: Optional[List[Dict[str, Any]]] = None
         )
     
     try:
-        genai.configure(api_key=api_key)
-        
-        # Build context from citations
-        context_parts = [f"MAIN TEXT:\n{text[:2000]}"]
-        
-        if citations:
-            cite_text = "\n\nRELATED DOCUMENTS:\n"
-            for i, c in enumerate(citations[:3]):
-                cite_text += f"{i+1}. From {c.get('filename', 'unknown')} (page {c.get('page_number', '?')}): {c.get('snippet', '')[:300]}\n"
-            context_parts.append(cite_text)
-        
-        full_context = "\n".join(context_parts)
-        
-        # Use a simpler, more direct prompt without JSON mode first
-        prompt = f"""Analyze this text and provide insights in the following categories:
-
-{full_context}
-
-Please provide:
-1. KEY INSIGHTS (3-5 main takeaways)
-2. DID YOU KNOW FACTS (2-4 interesting facts)
-3. EXAMPLES (2-3 concrete examples that illustrate the concepts)
-4. COUNTERPOINTS (1-2 alternative perspectives or limitations, if any)
-5. INSPIRATIONS (1-2 actionable ideas or applications)
-
-Format your response as valid JSON with these exact keys: "key_insights", "did_you_know_facts", "examples", "counterpoints", "inspirations"
-Each value should be an array of strings. Be specific and concrete."""
+        prompt = _insights_prompt(text, citations)
 
         # Try with JSON mode first
-        model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.8,
-                "top_p": 0.95,
-            }
-        )
+        model = _gemini_model(api_key, "insights")
         
         print(f"[DEBUG] Sending request to Gemini (text length: {len(text)})")
-        resp = model.generate_content(prompt)
+        async with _gemini_slots():
+            resp = await model.generate_content_async(prompt)
         
         # Handle response
         if hasattr(resp, 'text') and resp.text:
@@ -652,7 +1053,7 @@ Each value should be an array of strings. Be specific and concrete."""
             print(f"[DEBUG] Response preview: {raw_text[:200]}")
             
             try:
-                data = json.loads(raw_text)
+                data = _json_loads(raw_text.encode("utf-8"))
                 print(f"[DEBUG] Successfully parsed JSON")
             except json.JSONDecodeError as e:
                 print(f"[ERROR] JSON parse error: {e}")
@@ -663,7 +1064,7 @@ Each value should be an array of strings. Be specific and concrete."""
                 json_match = re.search(r'\{.*\}', raw_text, re.DOTALL)
                 if json_match:
                     try:
-                        data = json.loads(json_match.group())
+                        data = _json_loads(json_match.group().encode("utf-8"))
                         print(f"[DEBUG] Extracted and parsed JSON successfully")
                     except:
                         data = {}
@@ -671,41 +1072,23 @@ Each value should be an array of strings. Be specific and concrete."""
                     data = {}
             
             # Validate and normalize response
-            result = {
-                "key_insights": [],
-                "did_you_know_facts": [],
-                "counterpoints": [],
-                "inspirations": [],
-                "examples": [],
-            }
-            
-            if isinstance(data, dict):
-                # Map various possible key names to our expected format
-                key_mappings = {
-                    "key_insights": ["key_insights", "keyInsights", "insights", "main_insights"],
-                    "did_you_know_facts": ["did_you_know_facts", "didYouKnowFacts", "facts", "interesting_facts"],
-                    "examples": ["examples", "Examples"],
-                    "counterpoints": ["counterpoints", "Counterpoints", "limitations", "caveats"],
-                    "inspirations": ["inspirations", "Inspirations", "ideas", "applications"],
-                }
-                
-                for target_key, possible_keys in key_mappings.items():
-                    for key in possible_keys:
-                        if key in data and isinstance(data[key], list):
-                            result[target_key] = [str(item) for item in data[key] if item]
-                            break
+            result = _normalize_insights(data)
+            narration = data.get("narration") if isinstance(data, dict) else None
             
             print(f"[DEBUG] Final counts - insights:{len(result['key_insights'])}, facts:{len(result['did_you_know_facts'])}, examples:{len(result['examples'])}")
             
             # If all arrays are empty, try without JSON mode
             if not any(result.values()):
                 print(f"[WARNING] Empty result, retrying without JSON mode...")
-                return _gemini_insights_fallback(text, citations)
+                return await _gemini_insights_fallback(text, citations)
             
+            # Same round trip also drafted the default narration script (see /insights)
+            if isinstance(narration, str) and narration.strip():
+                result["narration"] = narration.strip()
             return result
         else:
             print(f"[ERROR] No text in Gemini response")
-            return _gemini_insights_fallback(text, citations)
+            return await _gemini_insights_fallback(text, citations)
     
     except HTTPException:
         raise
@@ -726,19 +1109,19 @@ Each value should be an array of strings. Be specific and concrete."""
             raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
 
-def _gemini_insights_fallback(text: str, citations: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+async def _gemini_insights_fallback(text: str, citations: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Fallback method without JSON mode - parse text response manually."""
     try:
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY"))
-        model = genai.GenerativeModel(model_name="gemini-2.5-flash")
+        model = _gemini_model(_GOOGLE_API_KEY or _GEMINI_API_KEY, "text")
         
         prompt = f"""Analyze this text and provide insights:
 
-{text[:2000]}
+{_truncate_to_tokens(text, _INSIGHTS_TEXT_TOKENS)}
 
 Provide 3-5 key insights, 2-3 interesting facts, and 2-3 concrete examples. Format as bullet points."""
 
-        resp = model.generate_content(prompt)
+        async with _gemini_slots():
+            resp = await model.generate_content_async(prompt)
         raw = resp.text if hasattr(resp, 'text') else ""
         
         print(f"[DEBUG FALLBACK] Response: {raw[:300]}")
@@ -786,13 +1169,39 @@ Provide 3-5 key insights, 2-3 interesting facts, and 2-3 concrete examples. Form
         return {"key_insights": [], "did_you_know_facts": [], "counterpoints": [], "inspirations": [], "examples": []}
 
 
-def _web_search(query: str, k: int = 3) -> List[Dict[str, Any]]:
+def _get_http_client() -> Optional[Any]:
+    """Shared httpx.AsyncClient: keeps connections to search/TTS APIs alive between requests."""
+    global _http_client
+    if _http_client is None and httpx is not None:
+        _http_client = httpx.AsyncClient(timeout=20, limits=httpx.Limits(max_keepalive_connections=20))
+    return _http_client
+
+
+def _gemini_slots() -> asyncio.Semaphore:
+    """Semaphore bounding in-flight async Gemini requests (env GEMINI_CONCURRENCY, default 16)."""
+    global _gemini_sem
+    if _gemini_sem is None:
+        _gemini_sem = asyncio.Semaphore(max(1, int(os.getenv("GEMINI_CONCURRENCY", "16"))))
+    return _gemini_sem
+
+
+async def _http_request(method: str, url: str, **kwargs: Any) -> Any:
+    """Issue an HTTP request without blocking the event loop.
+    Uses the shared httpx client; falls back to `requests` on a worker thread.
+    """
+    client = _get_http_client()
+    if client is not None:
+        return await client.request(method, url, **kwargs)
+    return await run_in_threadpool(requests.request, method, url, **kwargs)
+
+
+async def _web_search(query: str, k: int = 3) -> List[Dict[str, Any]]:
     """Perform a lightweight web search using Tavily or Bing (if API keys provided).
     Returns a list of dicts: { title, url, snippet }
     """
     results: List[Dict[str, Any]] = []
     q = (query or "").strip()
-    if not q or requests is None:
+    if not q or (httpx is None and requests is None):
         return results
     # Cache by query+k
     key = f"{_hash_short(q)}|{k}"
@@ -804,7 +1213,8 @@ def _web_search(query: str, k: int = 3) -> List[Dict[str, Any]]:
     tav_key = os.getenv("TAVILY_API_KEY", "").strip()
     if tav_key:
         try:
-            resp = requests.post(
+            resp = await _http_request(
+                "POST",
                 "https://api.tavily.com/search",
                 json={
                     "api_key": tav_key,
@@ -815,8 +1225,8 @@ def _web_search(query: str, k: int = 3) -> List[Dict[str, Any]]:
                 },
                 timeout=20,
             )
-            if resp.ok:
-                data = resp.json()
+            if 200 <= resp.status_code < 300:
+                data = _json_loads(resp.content)
                 for item in data.get("results", [])[:k]:
                     results.append({
                         "title": item.get("title", ""),
@@ -834,9 +1244,9 @@ def _web_search(query: str, k: int = 3) -> List[Dict[str, Any]]:
                 params = {"q": q, "count": max(1, min(10, k))}
                 headers = {"Ocp-Apim-Subscription-Key": bing_key}
                 url = f"https://api.bing.microsoft.com/v7.0/search?{urlencode(params)}"
-                resp = requests.get(url, headers=headers, timeout=20)
-                if resp.ok:
-                    data = resp.json()
+                resp = await _http_request("GET", url, headers=headers, timeout=20)
+                if 200 <= resp.status_code < 300:
+                    data = _json_loads(resp.content)
                     for item in (data.get("webPages", {}).get("value", []) or [])[:k]:
                         results.append({
                             "title": item.get("name", ""),
@@ -850,6 +1260,118 @@ def _web_search(query: str, k: int = 3) -> List[Dict[str, Any]]:
     return results
 
 
+# Page insights precomputed by the Gemini Batch API after /process (opt-in, INSIGHTS_BATCH_PREFETCH=1).
+# Keyed by (content digest, page), so a re-uploaded PDF with new content never serves the
+# old version's insights; bounded and written through like the other response caches.
+_batch_insights = PersistentCache(_cache_db_path or None, "batch_insights", ttl=7 * _DAY_S)  # (digest, page) -> insights
+_batch_tasks: Set["asyncio.Task[None]"] = set()
+_BATCH_TERMINAL_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+def _extract_page_texts(file_path: str) -> List[Tuple[int, str]]:
+    """(page_number, text) for every page with extractable text, in one document open."""
+    with _open_pdf(file_path) as doc:
+        out: List[Tuple[int, str]] = []
+        for idx in range(len(doc)):
+            page_text = (doc.load_page(idx).get_text("text") or "").strip()
+            if page_text:
+                out.append((idx + 1, page_text))
+        return out
+
+
+async def _prefetch_insights_batch(filename: str, file_path: str, digest: str) -> None:
+    """Generate insights for every page of a document as one Gemini Batch API job.
+
+    Batch jobs are billed at half the interactive price and don't count against the
+    interactive rate limit; the job is polled in the background and its results land
+    in _batch_insights, which /insights serves before calling Gemini synchronously.
+    """
+    api_key = _GOOGLE_API_KEY or _GEMINI_API_KEY
+    if genai_speech is None or not api_key:
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        pages = await loop.run_in_executor(_bg_executor, _extract_page_texts, file_path)
+        pages = [(pn, t) for pn, t in pages if (digest, pn) not in _batch_insights]
+        if not pages:
+            return
+        inline_requests = [
+            {
+                "contents": [{"role": "user", "parts": [{"text": _insights_prompt(t)}]}],
+                "metadata": {"page": str(pn)},
+                "config": {"response_mime_type": "application/json", "temperature": 0.8, "top_p": 0.95},
+            }
+            for pn, t in pages
+        ]
+        client = _genai_client(api_key)
+        job = await run_in_threadpool(
+            client.batches.create,
+            model=os.getenv("INSIGHTS_BATCH_MODEL", "gemini-2.5-flash"),
+            src=inline_requests,
+            config={"display_name": f"insights-{filename}"[:128]},
+        )
+        print(f"[insights-batch] submitted {job.name} for {filename} ({len(pages)} pages)")
+        poll_s = float(os.getenv("INSIGHTS_BATCH_POLL_S", "30"))
+        while getattr(job.state, "name", str(job.state)) not in _BATCH_TERMINAL_STATES:
+            await asyncio.sleep(poll_s)
+            job = await run_in_threadpool(client.batches.get, name=job.name)
+        state = getattr(job.state, "name", str(job.state))
+        if state != "JOB_STATE_SUCCEEDED":
+            print(f"[insights-batch] {job.name} ended in {state}")
+            return
+        responses = (job.dest.inlined_responses if job.dest else None) or []
+        for i, r in enumerate(responses):
+            try:
+                page = int((r.metadata or {}).get("page") or pages[i][0])
+                raw = (r.response.text if r.response else "") or ""
+                result = _normalize_insights(_json_loads(raw.encode("utf-8")))
+                if any(result.values()):
+                    _batch_insights[(digest, page)] = result
+            except Exception:
+                continue
+        print(f"[insights-batch] {job.name} done: {len(responses)} pages for {filename}")
+    except Exception as e:
+        print(f"[insights-batch] {filename} failed: {e}")
+
+
+def _schedule_insights_batch(filename: str, file_path: str, digest: str) -> None:
+    if os.getenv("INSIGHTS_BATCH_PREFETCH", "0") != "1":
+        return
+    task = asyncio.get_running_loop().create_task(_prefetch_insights_batch(filename, file_path, digest))
+    # Hold a reference until done so the task isn't garbage-collected mid-poll
+    _batch_tasks.add(task)
+    task.add_done_callback(_batch_tasks.discard)
+
+
+async def _retrieve_citations(text: str, k: int) -> List[Dict[str, Any]]:
+    """Top-k store chunks for /insights, one per (file, page).
+
+    Exact and near-duplicate texts (re-opened or slightly re-selected pages) are served
+    from _citations_cache, skipping the embed on an exact hit and the search on either.
+    """
+    # Store size invalidates entries on new uploads
+    scope = (len(store.texts), k)
+    cached = _citations_cache.get_exact(text, scope)
+    if cached is not None:
+        return cached
+    q_emb = await embed_query_async(text)
+    cached = _citations_cache.get(q_emb, scope)
+    if cached is not None:
+        return cached
+    row_ids, _ = store.search_ids(q_emb, k=max(1, k), fetch_k=max(10, k * 2))
+    # De-dup by (file, page): first (best-ranked) row per packed key, read from the columns
+    _, first = np.unique(store.page_keys(row_ids), return_index=True)
+    citations: List[Dict[str, Any]] = []
+    for i in row_ids[np.sort(first)][:k].tolist():
+        citations.append({
+            "filename": store.filename_at(i),
+            "page_number": int(store.page_numbers[i]),
+            "snippet": store.texts[i][:500]
+        })
+    _citations_cache.put(text, q_emb, scope, citations)
+    return citations
+
+
 @app.post("/insights")
 async def insights(req: InsightsRequest):
     """Generate insights using Gemini from provided text or a specific page of an uploaded PDF.
@@ -871,46 +1393,41 @@ async def insights(req: InsightsRequest):
     if not text:
         if not (req.filename and req.page_number):
             raise HTTPException(status_code=400, detail="Provide text, or filename + page_number")
-        file_path = str((_docs_dir / req.filename).absolute())
-        text = _extract_page_text(file_path, req.page_number).strip()
+        file_path = _doc_path(req.filename)
+        text = (await asyncio.get_running_loop().run_in_executor(_bg_executor, _extract_page_text, file_path, req.page_number)).strip()
         if not text:
             raise HTTPException(status_code=400, detail="No extractable text for the given page")
-    # Retrieve top-k related chunks for better grounded insights and citations
-    citations: List[Dict[str, Any]] = []
-    try:
-        model = _get_embedder()
-        q_emb = model.encode([text], convert_to_numpy=True, normalize_embeddings=True)[0]
-        raw = store.search(q_emb, k=max(1, req.k or 5), fetch_k=max(10, (req.k or 5) * 2))
-        seen: Set[Tuple[Optional[str], Optional[int]]] = set()
-        for r in raw:
-            md = r.get("metadata", {})
-            fname = md.get("filename")
-            pnum = md.get("page_number")
-            key = (fname, pnum)
-            if key in seen:
-                continue
-            seen.add(key)
-            citations.append({
-                "filename": fname,
-                "page_number": pnum,
-                "snippet": r.get("text", "")[:500]
-            })
-            if len(citations) >= (req.k or 5):
-                break
-    except Exception:
-        citations = []
-
-    # Optional: web augmentation
-    web_results: List[Dict[str, Any]] = []
-    if req.web:
+    # Retrieve top-k related chunks for better grounded insights and citations, and
+    # optionally augment with web results; both are awaited together so the web
+    # round trip overlaps the query embedding instead of following it
+    async def _web() -> List[Dict[str, Any]]:
+        if not req.web:
+            return []
         # Keep query compact to reduce search noise
         q = (text[:300] + ("…" if len(text) > 300 else "")).strip()
-        try:
-            web_results = _web_search(q, k=max(1, min(5, req.web_k)))
-        except Exception:
-            web_results = []
+        return await _web_search(q, k=max(1, min(5, req.web_k)))
 
-    result = _gemini_insights(text, citations, web_results)
+    citations, web_results = await asyncio.gather(_retrieve_citations(text, req.k or 5), _web(), return_exceptions=True)
+    if isinstance(citations, Exception):
+        citations = []
+    if isinstance(web_results, Exception):
+        web_results = []
+
+    batch_hit = None
+    if req.filename and req.page_number and not (req.text and req.text.strip()) and not web_results:
+        digest = _indexed_digests.get(req.filename)
+        if digest:
+            batch_hit = _batch_insights.get((digest, int(req.page_number)))
+    if batch_hit is not None:
+        result = batch_hit
+    else:
+        result = await _gemini_insights(text, citations, web_results)
+    # The insights call also produced a narration of the page; seed the script cache so a
+    # follow-up /generate-audio for the same text skips its own Gemini round trip. Only when
+    # the prompt saw the whole text (it is cut to _INSIGHTS_TEXT_TOKENS there).
+    narration = result.get("narration")
+    if narration and _truncate_to_tokens(text, _INSIGHTS_TEXT_TOKENS) == text:
+        _script_cache.setdefault(_script_cache_key(text), (narration, _hash_short(narration)))
     return {
         "key_insights": result.get("key_insights", []),
         "did_you_know_facts": result.get("did_you_know_facts", []),
@@ -941,76 +1458,78 @@ def _select_diverse_pages(page_texts: Dict[int, str], k: int) -> List[int]:
     # If k >= pages, return all pages sorted by page number
     if k >= len(items):
         return [p for p, _, _ in sorted(items, key=lambda x: x[0])]
-    # Candidate pool: top k*3 by length to cap compute
-    cand = sorted(items, key=lambda x: x[2], reverse=True)[: max(1, min(len(items), k * 3))]
+    # Candidate pool: top k*3 by length to cap compute. argpartition picks the pool
+    # without sorting every page; only the pool itself is ordered (longest first).
+    # Ties on length keep page order, as a stable sort would.
+    n_items = len(items)
+    lengths = np.fromiter((n for _, _, n in items), dtype=np.int64, count=n_items)
+    order_key = -lengths * n_items + np.arange(n_items)
+    m = max(1, min(n_items, k * 3))
+    top = np.argpartition(order_key, m - 1)[:m] if m < n_items else np.arange(n_items)
+    top = top[np.argsort(order_key[top])]
+    cand = [items[i] for i in top.tolist()]
     pages = [p for p, _, _ in cand]
     texts = [t for _, t, _ in cand]
     try:
         model = _get_embedder()
-        embs = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        embs = np.asarray(model.encode(texts, convert_to_numpy=True, normalize_embeddings=True), dtype=np.float32)
     except Exception:
         return [p for p, _, _ in cand[:k]]
-    # Greedy max-min selection
-    selected: List[int] = []
-    selected_idx: List[int] = []
-    # seed with the longest page (index 0 in cand)
-    selected.append(pages[0])
-    selected_idx.append(0)
-    while len(selected) < k and len(selected) < len(pages):
-        best_i = None
-        best_score = -1.0
-        for i in range(len(pages)):
-            if i in selected_idx:
-                continue
-            # max-min distance (1 - cosine since embs normalized and search uses inner product)
-            dmin = 1.0
-            for si in selected_idx:
-                sim = float(np.dot(embs[i], embs[si]))
-                dist = 1.0 - sim
-                if dist < dmin:
-                    dmin = dist
-            if dmin > best_score:
-                best_score = dmin
-                best_i = i
-        if best_i is None:
-            break
+    # Greedy max-min selection, seeded with the longest page (index 0 in cand).
+    # All pairwise distances (1 - cosine) come from one GEMM over the small pool; dmin
+    # holds each candidate's distance (capped at 1.0) to its nearest selected page and
+    # each pick updates it with one vectorized row minimum.
+    dist = 1.0 - embs @ embs.T
+    selected_idx: List[int] = [0]
+    dmin = np.minimum(1.0, dist[0])
+    dmin[0] = -np.inf
+    while len(selected_idx) < k and len(selected_idx) < len(pages):
+        best_i = int(np.argmax(dmin))
         selected_idx.append(best_i)
-        selected.append(pages[best_i])
-    return selected
+        dmin = np.minimum(dmin, dist[best_i])
+        dmin[best_i] = -np.inf
+    return [pages[i] for i in selected_idx]
+
+
+def _doc_claim_pages(filename: str, max_per_doc: int) -> Tuple[List[int], Dict[int, str]]:
+    """Pick up to max_per_doc diverse pages of a document: (chosen pages, text per page).
+
+    Blocking (it may embed the page texts), so async callers run it in an executor.
+    """
+    # Gather this file's chunks, already grouped by page in the store's page index
+    pages = store.page_rows(filename)
+    if not pages:
+        return [], {}
+    # Build per-page text and select a diverse subset of pages
+    page_full: Dict[int, str] = {}
+    for p, rows in pages.items():
+        page_full[p] = "\n".join(store.texts[i] for i in rows.tolist())
+    chosen_pages = _select_diverse_pages(page_full, max_per_doc) or [p for p in sorted(pages.keys())[:max_per_doc]]
+    return chosen_pages, page_full
 
 
-def _extract_doc_claims(filename: str, max_per_doc: int = 6, deep: bool = False) -> List[Dict[str, Any]]:
+async def _extract_doc_claims(filename: str, max_per_doc: int = 6, deep: bool = False) -> List[Dict[str, Any]]:
     """Return a list of concise claims for a document with page refs.
     Strategy:
       1) Select up to max_per_doc pages with the most content.
       2) Ask Gemini to extract 3-8 factual claims with page refs and short quotes.
       3) Fallback to raw snippets if LLM isn't available.
+    Page selection runs in _bg_executor; the Gemini call is awaited on the event loop, so
+    concurrent documents don't each hold a worker thread for the round trip.
     """
-    # Gather chunks for this file
-    chunks: List[Tuple[str, Dict[str, Any]]] = [
-        (t, m) for t, m in zip(store.texts, store.metadatas) if m.get("filename") == filename
-    ]
-    if not chunks:
+    loop = asyncio.get_running_loop()
+    chosen_pages, page_full = await loop.run_in_executor(_bg_executor, _doc_claim_pages, filename, max_per_doc)
+    if not chosen_pages:
         return []
-    # Group by page
-    pages: Dict[int, List[str]] = {}
-    for t, m in chunks:
-        p = int(m.get("page_number") or 0)
-        pages.setdefault(p, []).append(t)
-    # Build per-page text and select a diverse subset of pages
-    page_full: Dict[int, str] = {}
-    for p, segs in pages.items():
-        page_full[p] = "\n".join(segs)
-    chosen_pages = _select_diverse_pages(page_full, max_per_doc) or [p for p in sorted(pages.keys())[:max_per_doc]]
 
     # Prepare sections for LLM with page markers
     sections = []
     for p in chosen_pages:
         joined = page_full.get(p, "")
-        sections.append({"page_number": p, "text": joined[:900]})
+        sections.append({"page_number": p, "text": _truncate_to_tokens(joined, 225)})
 
     # If Gemini not available, fallback to snippets
-    if (not deep) or genai is None or not os.getenv("GOOGLE_API_KEY"):
+    if (not deep) or genai is None or not _GOOGLE_API_KEY:
         fallback: List[Dict[str, Any]] = []
         for s in sections:
             fallback.append({
@@ -1022,11 +1541,7 @@ def _extract_doc_claims(filename: str, max_per_doc: int = 6, deep: bool = False)
 
     # Call Gemini once per document to extract claims
     try:
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
-            generation_config={"response_mime_type": "application/json"}
-        )
+        model = _gemini_model(_GOOGLE_API_KEY, "json")
         sec_text = []
         for s in sections:
             sec_text.append(f"PAGE {s['page_number']}\n{s['text']}")
@@ -1043,9 +1558,10 @@ Sections:
 
 {sections_block}
 """
-        resp = model.generate_content(prompt)
+        async with _gemini_slots():
+            resp = await model.generate_content_async(prompt)
         raw = (getattr(resp, "text", None) or "").strip()
-        data = json.loads(raw) if raw else {}
+        data = _json_loads(raw.encode("utf-8")) if raw else {}
         items = data.get("claims", []) if isinstance(data, dict) else []
         claims: List[Dict[str, Any]] = []
         for it in items:
@@ -1075,18 +1591,14 @@ Sections:
     return claims
 
 
-def _gemini_cross_compare(doc_claims: List[Dict[str, Any]], focus: Optional[str] = None) -> Dict[str, Any]:
+async def _gemini_cross_compare(doc_claims: List[Dict[str, Any]], focus: Optional[str] = None) -> Dict[str, Any]:
     """Use Gemini to compare claims across documents, returning agreements and contradictions with references."""
     if genai is None:
         return {"agreements": [], "contradictions": [], "notes": []}
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = _GOOGLE_API_KEY
     if not api_key:
         return {"agreements": [], "contradictions": [], "notes": []}
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(
-        model_name="gemini-2.5-flash",
-        generation_config={"response_mime_type": "application/json"}
-    )
+    model = _gemini_model(api_key, "json")
 
     refs: List[str] = []
     for i, c in enumerate(doc_claims):
@@ -1103,7 +1615,7 @@ def _gemini_cross_compare(doc_claims: List[Dict[str, Any]], focus: Optional[str]
                 pass
         if c.get("snippet") and not c.get("statement"):
             line += c.get("snippet")
-        refs.append(line.strip())
+        refs.append(_truncate_to_tokens(line.strip(), 200))
     refs_block = "\n\n".join(refs)
 
     prompt = f"""
@@ -1131,9 +1643,10 @@ References:
 """
 
     try:
-        resp = model.generate_content(prompt)
+        async with _gemini_slots():
+            resp = await model.generate_content_async(prompt)
         raw = (getattr(resp, "text", None) or "").strip()
-        data = json.loads(raw) if raw else {}
+        data = _json_loads(raw.encode("utf-8")) if raw else {}
         return {
             "agreements": data.get("agreements", []) if isinstance(data, dict) else [],
             "contradictions": data.get("contradictions", []) if isinstance(data, dict) else [],
@@ -1151,15 +1664,24 @@ async def cross_insights(request: CrossInsightsRequest):
     """
     print(f"cross_insights called with request={request}")
     try:
-        # Determine files to analyze
+        # Determine files to analyze; one stat per file, reused for its cache signature
+        stats: Dict[str, os.stat_result] = {}
         if request.filenames:
-            files = [f for f in request.filenames if (_docs_dir / f).is_file() and f.lower().endswith(".pdf")]
+            for f in request.filenames:
+                if not f.lower().endswith(".pdf") or _UNSAFE_FILENAME_RE.search(f):
+                    continue
+                try:
+                    st = os.stat(os.path.join(_docs_dir_str, f))
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    stats[f] = st
         else:
             try:
-                files = [p.name for p in _docs_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pdf"]
+                stats = {e.name: e.stat() for e in _pdf_entries()}
             except Exception:
-                files = []
-        files.sort()
+                stats = {}
+        files = sorted(stats)
         if len(files) < 2:
             raise HTTPException(status_code=400, detail="At least two PDFs are required for cross-insights")
     except HTTPException:
@@ -1169,24 +1691,30 @@ async def cross_insights(request: CrossInsightsRequest):
 
     # Collect claims with simple per-file caching based on (mtime,size)
     all_claims: List[Dict[str, Any]] = []
-    cache_key_parts = []
-    loop = asyncio.get_running_loop()
     tasks = []
     
     try:
-        for f in files:
-            sig = _file_signature(f) + ("|deep" if request.deep else "|fast")
-            cache_key_parts.append(sig)
-            if (not request.force) and (sig in _doc_claims_cache):
+        # The cross result depends only on the file signatures and request options, so a
+        # cache hit returns before any per-document claims are loaded or extracted
+        sigs = [_file_signature(f, stats[f]) + ("|deep" if request.deep else "|fast") for f in files]
+        cross_key = _hash_short("|".join(sigs) + f"|m{request.max_per_doc}|deep{1 if request.deep else 0}|focus{(request.focus or '').strip().lower()}")
+        if not request.force:
+            cached = _cross_insights_cache.get(cross_key)
+            if cached is not None:
+                return cached
+
+        for f, sig in zip(files, sigs):
+            cached_claims = None if request.force else _doc_claims_cache.get(sig)
+            if cached_claims is not None:
                 # Use cached directly
-                all_claims.extend(_doc_claims_cache[sig])
+                all_claims.extend(cached_claims)
                 continue
-            # Offload extraction to background thread
-            def _job(file=f, signature=sig):
-                c = _extract_doc_claims(file, max_per_doc=max(2, request.max_per_doc), deep=bool(request.deep))
+            # Page selection runs on the executor inside; Gemini calls overlap on the loop
+            async def _job(file=f, signature=sig):
+                c = await _extract_doc_claims(file, max_per_doc=max(2, request.max_per_doc), deep=bool(request.deep))
                 _doc_claims_cache[signature] = c
                 return c
-            tasks.append(loop.run_in_executor(_bg_executor, _job))
+            tasks.append(_job())
 
         if tasks:
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -1201,12 +1729,7 @@ async def cross_insights(request: CrossInsightsRequest):
         if not all_claims:
             return {"agreements": [], "contradictions": [], "notes": []}
 
-        cross_key = _hash_short("|".join(cache_key_parts) + f"|m{request.max_per_doc}|deep{1 if request.deep else 0}|focus{(request.focus or '').strip().lower()}")
-        cached = _cross_insights_cache.get(cross_key)
-        if (not request.force) and (cached is not None):
-            return cached
-
-        result = _gemini_cross_compare(all_claims, focus=request.focus)
+        result = await _gemini_cross_compare(all_claims, focus=request.focus)
         # Heuristic retry: if both arrays empty but we have many claims, try once more with a narrowed focus built from frequent terms
         if not result.get("agreements") and not result.get("contradictions") and len(all_claims) >= 4:
             try:
@@ -1224,7 +1747,7 @@ async def cross_insights(request: CrossInsightsRequest):
                 top = [w for w, _ in Counter(words).most_common(5)]
                 alt_focus = " ".join(top[:3]) if top else None
                 if alt_focus:
-                    result = _gemini_cross_compare(all_claims, focus=alt_focus)
+                    result = await _gemini_cross_compare(all_claims, focus=alt_focus)
             except Exception:
                 pass
         # Cache and respond (optionally include claims for debugging)
@@ -1254,24 +1777,19 @@ class GenerateAudioRequest(BaseModel):
     two_speakers: Optional[bool] = None  # explicit control for two-speaker mode
 
 
-def _gemini_script(text: str, podcast: bool = False, accent: Optional[str] = None, style: Optional[str] = None, expressiveness: Optional[str] = None, two_speakers: bool = False) -> str:
+async def _gemini_script(text: str, podcast: bool = False, accent: Optional[str] = None, style: Optional[str] = None, expressiveness: Optional[str] = None, two_speakers: bool = False) -> str:
     """Use Gemini to convert raw context into a narration or dialogue script.
     When podcast=True or expressiveness is specified, produce a warmer, more natural script.
     Accent/style hints are woven subtly (no phonetic spellings) to encourage region-appropriate phrasing.
     If two_speakers=True, produce alternating lines for "Speaker A" and "Speaker B".
+    Awaits the async Gemini client so the event loop keeps serving other requests meanwhile.
     """
     if genai is None:
         return text[:1500]
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = _GOOGLE_API_KEY
     if not api_key:
         return text[:1500]
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(
-        model_name="gemini-2.5-flash",
-        generation_config={
-            "response_mime_type": "text/plain"
-        }
-    )
+    model = _gemini_model(api_key, "script")
     # Build dynamic guidance
     accent_hint = f"Accent preference: {accent}." if accent else ""
     style_hint = f" Voice/style hint: {style}." if style else ""
@@ -1324,7 +1842,8 @@ Content:
 {text}
 """
     try:
-        resp = model.generate_content(prompt)
+        async with _gemini_slots():
+            resp = await model.generate_content_async(prompt)
         raw = (getattr(resp, "text", None) or "").strip()
         return raw or text[:1500]
     except Exception:
@@ -1332,24 +1851,42 @@ Content:
 
 
 def _synthesize_speech(text: str, voice: Optional[str] = None, fmt: Optional[str] = None, accent: Optional[str] = None, style: Optional[str] = None, deterministic_basename: Optional[str] = None, provider_override: Optional[str] = None) -> Tuple[str, str]:
+    """Synthesize speech (see _render_speech) and record the output in the audio file index."""
+    filename, rel_url = _render_speech(text, voice=voice, fmt=fmt, accent=accent, style=style, deterministic_basename=deterministic_basename, provider_override=provider_override)
+    _index_audio(filename)
+    return filename, rel_url
+
+
+def _render_speech(text: str, voice: Optional[str] = None, fmt: Optional[str] = None, accent: Optional[str] = None, style: Optional[str] = None, deterministic_basename: Optional[str] = None, provider_override: Optional[str] = None) -> Tuple[str, str]:
     """Synthesize speech from text into a file using the selected provider.
     Preference: Edge-TTS for natural voices, then Hugging Face (Dia-1.6B), then offline pyttsx3.
     You can force provider via env TTS_PROVIDER: 'edge_tts', 'hf_dia' or 'pyttsx3'.
     Returns (filename, public_relative_url).
     """
-    provider = (provider_override or os.getenv("TTS_PROVIDER") or "").lower().strip()
-    hf_token = os.getenv("HUGGINGFACE_API_TOKEN")
-    hf_model = os.getenv("HF_DIA_MODEL", "nari-labs/Dia-1.6B")
+    provider = (provider_override or _TTS_PROVIDER).lower().strip()
+    hf_token = _HF_TOKEN
+    hf_model = _HF_DIA_MODEL
+
+    # Stable, content-derived stem (process-independent, unlike hash()/uuid) so identical
+    # requests map to the same file and an existing one is returned without synthesis
+    stem = deterministic_basename or f"tts_{_hash_short('|'.join([provider or 'gemini', voice or '', accent or '', style or '', text]))}_gem"
+    existing = _existing_audio(stem)
+    if existing is not None:
+        return existing
 
     # Always use Gemini TTS implementation
+    try:
+        genai_types = genai_speech.types if genai_speech is not None else None  # first touch loads google-genai
+    except ImportError:
+        genai_types = None
     if genai_speech is None or genai_types is None:
         raise HTTPException(status_code=500, detail="google-genai not installed on server")
-    api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+    api_key = _GEMINI_API_KEY or _GOOGLE_API_KEY
     if not api_key:
         raise HTTPException(status_code=503, detail="GEMINI_API_KEY not configured on server")
     try:
-        client = genai_speech.Client(api_key=api_key)
-        model_name = (os.getenv("GEMINI_TTS_MODEL") or "gemini-2.5-flash-preview-tts").strip()
+        client = _genai_client(api_key)
+        model_name = _GEMINI_TTS_MODEL
         candidate_models = [m for m in [model_name, "gemini-2.5-flash-preview-tts"] if m]
 
         contents = [genai_types.Content(role="user", parts=[genai_types.Part.from_text(text=text)])]
@@ -1425,7 +1962,7 @@ def _synthesize_speech(text: str, voice: Optional[str] = None, fmt: Optional[str
             raise HTTPException(status_code=502, detail="Gemini returned no audio; ensure model supports audio and API key has access")
 
         ext = "wav"
-        audio_data = bytes(data_buf)
+        header = b""
         if mime_type and "/" in mime_type:
             mt = mime_type.split("/")[-1].lower()
             print(f"[DEBUG] Detected format: {mt} from mime: {mime_type}")
@@ -1437,12 +1974,23 @@ def _synthesize_speech(text: str, voice: Optional[str] = None, fmt: Optional[str
                 ext = "ogg"
             else:
                 print(f"[DEBUG] Converting {mime_type} to WAV")
-                audio_data = _convert_to_wav(audio_data, mime_type)
+                header = _wav_header(len(data_buf), mime_type)
                 ext = "wav"
 
-        base = f"{deterministic_basename}.{ext}" if deterministic_basename else f"tts_{uuid.uuid4().hex[:8]}_gem.{ext}"
+        base = f"{stem}.{ext}"
         out_path = _audio_dir / base
-        out_path.write_bytes(audio_data)
+        # Write to a temp name and rename, so a failed write never leaves a truncated clip
+        # that the audio cache (keyed by this deterministic name) would later serve
+        tmp_path = out_path.with_name(f".{base}.{uuid.uuid4().hex[:8]}.part")
+        try:
+            # Header and samples straight from the receive buffer (no bytes() / concat copies)
+            with open(tmp_path, "wb") as fh:
+                if header:
+                    fh.write(header)
+                fh.write(data_buf)
+            os.replace(tmp_path, out_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
         return base, f"/audio/{base}"
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gemini speech failed: {e}")
@@ -1501,13 +2049,13 @@ def _synthesize_speech(text: str, voice: Optional[str] = None, fmt: Optional[str
     if False:  # Disabled - using Gemini TTS for all providers
         if genai_speech is None or genai_types is None:
             raise HTTPException(status_code=500, detail="google-genai not installed on server")
-        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+        api_key = _GEMINI_API_KEY or _GOOGLE_API_KEY
         if not api_key:
             raise HTTPException(status_code=503, detail="GEMINI_API_KEY not configured on server")
         try:
-            client = genai_speech.Client(api_key=api_key)
+            client = _genai_client(api_key)
             # Use the correct TTS model as per reference (flash, not pro)
-            model_name = (os.getenv("GEMINI_TTS_MODEL") or "gemini-2.5-flash-preview-tts").strip()
+            model_name = _GEMINI_TTS_MODEL
             candidate_models = [m for m in [model_name, "gemini-2.5-flash-preview-tts"] if m]
 
             # Build contents
@@ -1697,7 +2245,7 @@ def _synthesize_speech(text: str, voice: Optional[str] = None, fmt: Optional[str
     if deterministic_basename:
         base = f"{deterministic_basename}.{ext}"
     else:
-        base = f"tts_{abs(hash(text))}_{(voice_name or 'default').replace(' ','_')}.{ext}"
+        base = f"tts_{_hash_short(text)}_{(voice_name or 'default').replace(' ','_')}.{ext}"
     out_path = _audio_dir / base
     try:
         # Guard engine usage with a lock for thread safety
@@ -1717,12 +2265,47 @@ def _synthesize_speech(text: str, voice: Optional[str] = None, fmt: Optional[str
     return base, rel_url
 
 
+# Plain-narration requests for at most this many words (~60 s of speech, the length the
+# rewrite targets) are spoken as-is instead of being rewritten by Gemini first
+_VERBATIM_SCRIPT_WORDS = int(os.getenv("VERBATIM_SCRIPT_WORDS", "150"))
+_LIST_OR_URL_RE = re.compile(r"https?://|^\s*(?:[-*\u2022]|\d+[.)])\s", re.MULTILINE)
+
+
+def _is_verbatim_script(text: str) -> bool:
+    """Short prose without lists or URLs reads fine as it is."""
+    return len(text.split()) <= _VERBATIM_SCRIPT_WORDS and not _LIST_OR_URL_RE.search(text)
+
+
+def _script_cache_key(text: str, podcast: bool = False, two_speakers: bool = False, entire_pdf: bool = False, accent: Optional[str] = None, style: Optional[str] = None, expressiveness: Optional[str] = None) -> Tuple[Any, ...]:
+    # A tuple hashes component-wise and, unlike a "|"-joined string, can't collide when
+    # accent/style/expressiveness themselves contain the separator
+    return (
+        # Whole text: keying on a prefix let documents/pages sharing their opening
+        # paragraphs reuse each other's script (SHA-1 over long texts is cheap)
+        _hash_short(text),
+        bool(podcast),
+        bool(two_speakers),
+        bool(entire_pdf),
+        accent or None,
+        style or None,
+        expressiveness or None,
+    )
+
+
 @app.post("/generate-audio")
 async def generate_audio(req: GenerateAudioRequest):
+    """See _generate_audio. The result holds only plain JSON types, so it is rendered
+    directly (orjson when available) without FastAPI's jsonable_encoder pass."""
+    return _JSONResponseClass(await _generate_audio(req))
+
+
+async def _generate_audio(req: GenerateAudioRequest) -> Dict[str, Any]:
     """Generate (and cache) TTS audio from provided text or a specific page.
     Supports entire PDF podcast generation with natural two-speaker dialogue.
     Optimizations:
     - Script caching: repeated requests for same content + parameters reuse Gemini output.
+    - Short plain narrations (no podcast/accent/style/expressiveness, <= VERBATIM_SCRIPT_WORDS
+      words, no lists or URLs) are spoken verbatim without a Gemini rewrite.
     - Audio caching: identical script + voice/style/accent/provider returns existing file.
     - Offloaded synthesis to thread pool to avoid blocking event loop.
     """
@@ -1735,15 +2318,15 @@ async def generate_audio(req: GenerateAudioRequest):
     
     # Handle entire PDF processing
     if req.entire_pdf and req.filename:
-        file_path = str((_docs_dir / req.filename).absolute())
-        text = _extract_entire_pdf_text(file_path).strip()
+        file_path = _doc_path(req.filename)
+        text = (await asyncio.get_running_loop().run_in_executor(_bg_executor, _extract_entire_pdf_text, file_path)).strip()
         if not text:
             raise HTTPException(status_code=400, detail="No extractable text from PDF")
     elif not text:
         if not (req.filename and req.page_number):
             raise HTTPException(status_code=400, detail="Provide text, filename + page_number, or filename + entire_pdf=true")
-        file_path = str((_docs_dir / req.filename).absolute())
-        text = _extract_page_text(file_path, req.page_number).strip()
+        file_path = _doc_path(req.filename)
+        text = (await asyncio.get_running_loop().run_in_executor(_bg_executor, _extract_page_text, file_path, req.page_number)).strip()
         if not text:
             raise HTTPException(status_code=400, detail="No extractable text for the given page")
 
@@ -1751,66 +2334,87 @@ async def generate_audio(req: GenerateAudioRequest):
     two_speakers = req.two_speakers if req.two_speakers is not None else bool(req.podcast)
     
     # --- Script caching ---
-    script_key = "|".join([
-        _hash_short(text[:1000]),  # Use first 1000 chars for key to handle long texts
-        f"p{1 if req.podcast else 0}",
-        f"ts{1 if two_speakers else 0}",
-        f"ep{1 if req.entire_pdf else 0}",
-        req.accent or "-",
-        req.style or "-",
-        req.expressiveness or "-",
-    ])
+    script_key = _script_cache_key(
+        text,
+        podcast=bool(req.podcast),
+        two_speakers=two_speakers,
+        entire_pdf=bool(req.entire_pdf),
+        accent=req.accent,
+        style=req.style,
+        expressiveness=req.expressiveness,
+    )
     
-    script = _script_cache.get(script_key)
-    if script is None:
-        script = _gemini_script(
-            text,
-            podcast=bool(req.podcast),
-            accent=req.accent,
-            style=req.style,
-            expressiveness=req.expressiveness,
-            two_speakers=two_speakers,
-        )
-        _script_cache[script_key] = script
+    if not (two_speakers or req.podcast or req.accent or req.style or req.expressiveness) and _is_verbatim_script(text):
+        # Plain narration of a short passage: it already is the script, no Gemini rewrite
+        cached_script = (text, _hash_short(text))
+    else:
+        cached_script = _script_cache.get(script_key)
+    if cached_script:
+        script, script_hash = cached_script
+    else:
+        # Identical requests arriving while the script is being written share one Gemini call
+        pending = _script_inflight.get(script_key)
+        if pending is None:
+            pending = asyncio.ensure_future(_gemini_script(
+                text,
+                podcast=bool(req.podcast),
+                accent=req.accent,
+                style=req.style,
+                expressiveness=req.expressiveness,
+                two_speakers=two_speakers,
+            ))
+            _script_inflight[script_key] = pending
+            pending.add_done_callback(lambda _t, k=script_key: _script_inflight.pop(k, None))
+        script = await asyncio.shield(pending)
+        script_hash = _hash_short(script)
+        _script_cache[script_key] = (script, script_hash)
     try:
         print(f"[generate-audio] script ready len={len(script or '')} two_speakers={two_speakers}")
     except Exception:
         pass
 
-    provider = (os.getenv("TTS_PROVIDER") or "").lower().strip() or "auto"
+    provider = _TTS_PROVIDER or "auto"
 
     # Deterministic base name for caching (does not include random UUID)
     deterministic_base = "_".join([
         "tts",
-        _hash_short(script),
+        script_hash,
         provider,
         (req.accent or "na").replace('-', ''),
         (req.style or "na"),
         f"ts{1 if two_speakers else 0}",
     ])
 
-    audio_key = "|".join([
-        deterministic_base,
-        req.voice or "-",
-    ])
+    audio_key = (deterministic_base, req.voice or None)
     cached_audio = _audio_cache.get(audio_key)
-    if cached_audio:
+    # Entries outlive restarts, so make sure the file wasn't cleaned up in the meantime
+    if cached_audio and _audio_files.get(cached_audio[0].rpartition(".")[0]) == cached_audio[0]:
         return {"url": cached_audio[1], "cached": True}
     # Disk-backed cache: if file exists from a previous run, reuse it
-    for ext in ("mp3", "wav"):
-        candidate = _audio_dir / f"{deterministic_base}.{ext}"
-        if candidate.is_file():
-            rel_url = f"/audio/{candidate.name}"
-            _audio_cache[audio_key] = (candidate.name, rel_url)
-            return {"url": rel_url, "cached": True}
-
+    existing = _existing_audio(deterministic_base)
+    if existing is not None:
+        _audio_cache[audio_key] = existing
+        return {"url": existing[1], "cached": True}
+
+    # Identical requests arriving while this audio is being synthesized share one run
+    pending = _audio_inflight.get(audio_key)
+    if pending is None:
+        pending = asyncio.ensure_future(_render_audio(req, script, two_speakers, deterministic_base, audio_key, provider, start_ts))
+        _audio_inflight[audio_key] = pending
+        pending.add_done_callback(lambda _t, k=audio_key: _audio_inflight.pop(k, None))
+    return await asyncio.shield(pending)
+
+
+async def _render_audio(req: GenerateAudioRequest, script: str, two_speakers: bool, deterministic_base: str, audio_key: Tuple[Any, ...], provider: str, start_ts: float) -> Dict[str, Any]:
+    """Synthesize the audio for a /generate-audio cache miss and record it in _audio_cache."""
     loop = asyncio.get_running_loop()
     # If not podcast/two-speaker, synthesize as single take
     if not two_speakers:
         try:
             filename, rel_url = await loop.run_in_executor(
                 _tts_executor,
-                lambda: _synthesize_with_fallback(
+                partial(
+                    _synthesize_with_fallback,
                     script,
                     deterministic_base,
                     req.voice,
@@ -1830,7 +2434,7 @@ async def generate_audio(req: GenerateAudioRequest):
             pass
         
         # Generate single chapter for subtitles
-        dur = _get_audio_duration(_audio_dir / filename)
+        dur = await _get_audio_duration(_audio_dir / filename)
         chapters = [{
             "index": 0,
             "speaker": "Narrator",
@@ -1877,7 +2481,8 @@ async def generate_audio(req: GenerateAudioRequest):
         try:
             filename, rel_url = await loop.run_in_executor(
                 _tts_executor,
-                lambda: _synthesize_speech(
+                partial(
+                    _synthesize_speech,
                     script,
                     voice=req.voice,
                     fmt=req.format,
@@ -1893,7 +2498,7 @@ async def generate_audio(req: GenerateAudioRequest):
         _audio_cache[audio_key] = (filename, rel_url)
         
         # Generate single chapter for subtitles
-        dur = _get_audio_duration(_audio_dir / filename)
+        dur = await _get_audio_duration(_audio_dir / filename)
         chapters = [{
             "index": 0,
             "speaker": "Narrator",
@@ -1905,12 +2510,13 @@ async def generate_audio(req: GenerateAudioRequest):
         return {"url": rel_url, "parts": [rel_url], "chapters": chapters, "cached": False}
 
     # If Gemini is the provider, prefer single-call multi-speaker synthesis for the whole script
-    provider_eff = (os.getenv("TTS_PROVIDER") or "").lower().strip()
+    provider_eff = _TTS_PROVIDER
     if provider_eff == "gemini":
         try:
             filename, rel_url = await loop.run_in_executor(
                 _tts_executor,
-                lambda: _synthesize_speech(
+                partial(
+                    _synthesize_speech,
                     script,
                     voice=req.voice,
                     fmt=req.format,
@@ -1928,7 +2534,7 @@ async def generate_audio(req: GenerateAudioRequest):
                 pass
             
             # Generate single chapter for subtitles
-            dur = _get_audio_duration(_audio_dir / filename)
+            dur = await _get_audio_duration(_audio_dir / filename)
             chapters = [{
                 "index": 0,
                 "speaker": "Podcast",
@@ -1950,7 +2556,7 @@ async def generate_audio(req: GenerateAudioRequest):
     spk_voice: Dict[str, Optional[str]] = {}
     
     # Set default voices for natural podcast experience
-    provider_eff = (os.getenv("TTS_PROVIDER") or "").lower().strip()
+    provider_eff = _TTS_PROVIDER
     if provider_eff == "google":
         # Use Google voices from env
         vA = os.getenv("GOOGLE_TTS_VOICE_A", "en-US-Neural2-C")
@@ -2005,15 +2611,15 @@ async def generate_audio(req: GenerateAudioRequest):
             else:
                 spk_voice[speaker_key] = voice_val
 
-    # Generate individual clips with pauses
-    clip_files: List[Path] = []
-    clip_urls: List[str] = []
-    for idx, (spk, content) in enumerate(lines):
+    # Generate individual clips concurrently (bounded), keeping the original line order
+    line_sem = asyncio.Semaphore(max(1, int(os.getenv("TTS_LINE_CONCURRENCY", "8"))))
+
+    async def _synthesize_line(idx: int, spk: str, content: str) -> Optional[Tuple[str, str]]:
         basename = f"{deterministic_base}_part{idx:03d}"
         voice_choice = spk_voice.get(spk) or req.voice
         # Derive accent from Google voice name if provider=google and accent not explicitly set
         eff_accent = req.accent
-        provider_eff = (os.getenv("TTS_PROVIDER") or "").lower().strip()
+        provider_eff = _TTS_PROVIDER
         if provider_eff == "google" and not eff_accent and isinstance(voice_choice, str) and "-" in voice_choice:
             try:
                 parts = voice_choice.split("-")[:2]
@@ -2023,46 +2629,54 @@ async def generate_audio(req: GenerateAudioRequest):
         # Provider plan: if a provider is explicitly set via TTS_PROVIDER, use ONLY that provider
         # to avoid mixing voices. Otherwise, try a sensible fallback order.
         tried: List[str] = []
-        fn = None
-        url_rel = None
-        pref = (os.getenv("TTS_PROVIDER") or "").lower().strip()
+        pref = _TTS_PROVIDER
         all_providers = ["gemini", "google", "edge_tts", "hf_dia", "pyttsx3"]
         if pref in all_providers:
             providers_plan = [pref]
         else:
             providers_plan = all_providers
-        for prov in providers_plan:
-            tried.append(prov)
-            try:
-                candidate = await loop.run_in_executor(
-                    _tts_executor,
-                    lambda p=prov: _synthesize_speech(
-                        content,
-                        voice=voice_choice,
-                        fmt=req.format,
-                        accent=eff_accent or req.accent,
-                        style=None,
-                        # Tag per-line filename with provider to reflect actual synthesis source
-                        deterministic_basename=f"{basename}_{p}",
-                        provider_override=p,
-                    ),
-                )
-                if candidate and isinstance(candidate, tuple):
-                    fn, url_rel = candidate
-                    break
-            except Exception as e:
+        async with line_sem:
+            for prov in providers_plan:
+                tried.append(prov)
                 try:
-                    print(f"[generate-audio] per-line provider={prov} error: {e}")
-                except Exception:
-                    pass
-                continue
-        if not fn or not url_rel:
-            # Skip failed lines, continue others
-            try:
-                print(f"[generate-audio] line {idx} failed tried={tried}")
-            except Exception:
-                pass
+                    candidate = await loop.run_in_executor(
+                        _tts_executor,
+                        partial(
+                            _synthesize_speech,
+                            content,
+                            voice=voice_choice,
+                            fmt=req.format,
+                            accent=eff_accent or req.accent,
+                            style=None,
+                            # Tag per-line filename with provider to reflect actual synthesis source
+                            deterministic_basename=f"{basename}_{prov}",
+                            provider_override=prov,
+                        ),
+                    )
+                    if candidate and isinstance(candidate, tuple):
+                        return candidate
+                except Exception as e:
+                    try:
+                        print(f"[generate-audio] per-line provider={prov} error: {e}")
+                    except Exception:
+                        pass
+                    continue
+        # Skip failed lines, continue others
+        try:
+            print(f"[generate-audio] line {idx} failed tried={tried}")
+        except Exception:
+            pass
+        return None
+
+    line_results = await asyncio.gather(*[
+        _synthesize_line(idx, spk, content) for idx, (spk, content) in enumerate(lines)
+    ])
+    clip_files: List[Path] = []
+    clip_urls: List[str] = []
+    for res in line_results:
+        if not res or not res[0] or not res[1]:
             continue
+        fn, url_rel = res
         clip_files.append((_audio_dir / fn))
         clip_urls.append(url_rel)
 
@@ -2073,18 +2687,8 @@ async def generate_audio(req: GenerateAudioRequest):
     chapters: List[Dict[str, Any]] = []
     durations_sec: List[float] = []
     try:
-        import subprocess
-        for i, path in enumerate(clip_files):
-            try:
-                cmd = [
-                    'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1', path.name
-                ]
-                res = subprocess.run(cmd, capture_output=True, text=True, cwd=str(_audio_dir), timeout=10)
-                dur = float(res.stdout.strip()) if res.returncode == 0 and res.stdout.strip() else 0.0
-            except Exception:
-                dur = 0.0
-            durations_sec.append(max(0.0, dur))
+        # Probe all clips concurrently
+        durations_sec = [max(0.0, d) for d in await asyncio.gather(*[_get_audio_duration(p) for p in clip_files])]
     except Exception:
         durations_sec = [0.0 for _ in clip_files]
     # Accumulate timestamps
@@ -2105,9 +2709,6 @@ async def generate_audio(req: GenerateAudioRequest):
 
     # Concatenation using ffmpeg (re-encode to MP3 for robustness)
     try:
-        import subprocess
-        import sys
-        
         final_name = f"{deterministic_base}_podcast.mp3"
         final_path = _audio_dir / final_name
         
@@ -2124,12 +2725,18 @@ async def generate_audio(req: GenerateAudioRequest):
             '-i', str(filelist_path), '-c:a', 'libmp3lame', '-b:a', '160k', '-ar', '44100', str(final_path)
         ]
         
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, cwd=str(_audio_dir))
+        # The re-encode takes seconds and must not stall other requests: run it on a worker
+        # thread (not create_subprocess_exec, which Windows' SelectorEventLoop can't do)
+        result = await run_in_threadpool(
+            subprocess.run, ffmpeg_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, cwd=str(_audio_dir)
+        )
+        returncode = result.returncode
         
         # Clean up temp file list only (keep parts for chapter playback / fallback)
         filelist_path.unlink(missing_ok=True)
         
-        if result.returncode == 0 and final_path.exists():
+        if returncode == 0 and final_path.exists():
+            _index_audio(final_name)
             final_url = f"/audio/{final_name}"
             _audio_cache[audio_key] = (final_name, final_url)
             try:
@@ -2143,7 +2750,8 @@ async def generate_audio(req: GenerateAudioRequest):
                 first_clip = clip_urls[0]
                 _audio_cache[audio_key] = (clip_files[0].name, first_clip)
                 try:
-                    print(f"[generate-audio] concat failed, returning first clip elapsed={time.time()-start_ts:.1f}s")
+                    err = (result.stderr or b"").decode("utf-8", "replace").strip().splitlines()[-1:]
+                    print(f"[generate-audio] concat failed (ffmpeg exit {returncode}: {' '.join(err)}), returning first clip elapsed={time.time()-start_ts:.1f}s")
                 except Exception:
                     pass
                 return {"url": first_clip, "parts": clip_urls, "chapters": chapters, "cached": False}
@@ -2159,9 +2767,16 @@ async def generate_audio(req: GenerateAudioRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process audio: {e}")
 
+_ROOT_BYTES = json.dumps({"message": "Hello World"}, separators=(",", ":")).encode("utf-8")
+
+
 @app.get("/")
-def read_root():
-    return {"message": "Hello World"}
+async def read_root():
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+_SPOOL_MAX_SIZE = 1024 * 1024  # Starlette's UploadFile in-memory limit before it rolls to disk
 
 
 @app.post("/upload")
@@ -2174,17 +2789,69 @@ async def upload_files(files: List[UploadFile] = File(...)):
     save_dir = base_dir / "document_library"
     save_dir.mkdir(parents=True, exist_ok=True)
 
-    saved: List[str] = []
-    for f in files:
-        # Prevent path traversal by using only the name component
-        safe_name = Path(f.filename).name if f.filename else "upload.bin"
-        target = save_dir / safe_name
-        content = await f.read()
-        with open(target, "wb") as out:
-            out.write(content)
-        saved.append(safe_name)
+    # Save all files concurrently; gather keeps the original order for the response
+    saved: List[str] = list(await asyncio.gather(*[_save_upload(f, save_dir) for f in files]))
+
+    return _JSONResponseClass({"saved": saved})
+
+
+def _copy_upload(src: Any, target: Path) -> None:
+    # Write next to the target and rename into place, so the library listing, startup
+    # indexing and /process never see a half-written PDF while a large upload is copied
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.part")
+    try:
+        _write_upload(src, tmp)
+        # Release any cached handle on the old file first (Windows can't overwrite an open file)
+        _forget_pdf(str(target.absolute()))
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _upload_fd(src: Any) -> Optional[int]:
+    """OS file descriptor behind a large spooled upload, or None to copy through Python.
 
-    return {"saved": saved}
+    Starlette spools bodies over 1 MiB to a real temp file; below that, fileno() would
+    force an in-memory body out to disk just to copy it again, so small ones are skipped.
+    """
+    try:
+        if src.seek(0, os.SEEK_END) < _SPOOL_MAX_SIZE:
+            return None
+        return src.fileno()
+    except (AttributeError, OSError, ValueError):  # io.UnsupportedOperation is an OSError
+        return None
+    finally:
+        src.seek(0)
+
+
+def _write_upload(src: Any, target: Path) -> None:
+    in_fd = _upload_fd(src) if hasattr(os, "sendfile") else None
+    with open(target, "wb") as out:
+        # Large uploads are backed by a real temp file: let the kernel copy it (no bytes
+        # objects materialized in Python at all)
+        if in_fd is not None:
+            size = os.fstat(in_fd).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(out.fileno(), in_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            if offset >= size:
+                return
+            src.seek(offset)
+        # Stream in fixed-size chunks so peak memory stays O(chunk) instead of O(file size)
+        shutil.copyfileobj(src, out, _UPLOAD_CHUNK_SIZE)
+
+
+async def _save_upload(f: UploadFile, save_dir: Path) -> str:
+    # Prevent path traversal by using only the name component
+    safe_name = Path(f.filename).name if f.filename else "upload.bin"
+    target = save_dir / safe_name
+    # The body is already spooled by Starlette; copy it to disk on a worker thread so
+    # blocking writes never stall the event loop
+    await run_in_threadpool(_copy_upload, f.file, target)
+    return safe_name
 
 
 @app.post("/process")
@@ -2192,35 +2859,46 @@ async def process_document(filename: str):
     """Process a previously uploaded PDF and add it to the vector store.
     This is separated from upload to avoid timeouts.
     """
-    base_dir = Path(__file__).resolve().parent
-    save_dir = base_dir / "document_library"
-    target = save_dir / filename
-    
-    if not target.exists():
+    target = _doc_path(filename)
+    loop = asyncio.get_running_loop()
+    try:
+        # Hashing opens the file anyway, so a missing file surfaces here instead of via
+        # a separate exists() stat up front
+        digest = await run_in_threadpool(_file_digest, target)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
         raise HTTPException(status_code=404, detail=f"File {filename} not found")
-    
+
     try:
-        processed = process_pdf(str(target))
+        # Re-uploading identical bytes: the chunks are already in the store, so skip
+        # parsing and don't insert a second copy of every vector
+        if _indexed_digests.get(filename) == digest:
+            return {"status": "success", "chunks": len(store.rows_for(filename)), "cached": True}
+        processed = await loop.run_in_executor(_bg_executor, process_pdf, target)
         if processed:
             store.add_documents(processed, filename=filename)
+            _indexed_digests[filename] = digest
+            _schedule_insights_batch(filename, target, digest)
             return {"status": "success", "chunks": len(processed)}
         else:
             return {"status": "no_content", "chunks": 0}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
-def _get_audio_duration(path: Path) -> float:
-    """Get duration of audio file in seconds using ffprobe."""
+async def _get_audio_duration(path: Path) -> float:
+    """Get duration of audio file in seconds using ffprobe (on a worker thread, never blocks the loop).
+
+    A blocking subprocess.run in the threadpool rather than asyncio.create_subprocess_exec:
+    the SelectorEventLoop uvicorn uses on Windows with --reload can't spawn subprocesses.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1', path.name
+    ]
     try:
-        import subprocess
-        cmd = [
-            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1', path.name
-        ]
         # Run in the directory of the file to avoid path issues
-        res = subprocess.run(cmd, capture_output=True, text=True, cwd=str(path.parent), timeout=10)
+        res = await run_in_threadpool(subprocess.run, cmd, capture_output=True, text=True, cwd=str(path.parent), timeout=10)
         if res.returncode == 0 and res.stdout.strip():
             return float(res.stdout.strip())
-    except Exception:
-        pass
+    except Exception as e:
+        print(f"[audio] ffprobe failed for {path.name}: {type(e).__name__}: {e}")
     return 0.0
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import json
+import sqlite3
+import threading
+import time
+
+
+class PersistentCache:
+    """A dict-like response cache written through to SQLite, so entries survive restarts.
+
+    Reads hit a bounded in-memory LRU first and fall back to the table on a miss; writes
+    go to both. Each cache owns one table (several caches can share a database file).
+    Entries older than `ttl` seconds are treated as missing. Keys are strings or tuples of
+    JSON scalars (used as-is in memory, JSON-encoded in the table); values must be
+    JSON-serializable (tuples come back as lists).
+
+    The table keeps at most `max_rows` of the most recently written entries (default:
+    16x the memory tier); expired and excess rows are pruned on open and every
+    _PRUNE_EVERY writes.
+
+    Without a `path` (or if the database can't be opened) it is a plain in-memory LRU.
+    """
+
+    def __init__(self, path: Optional[str], table: str, ttl: Optional[float] = None, max_entries: int = 4096, max_rows: Optional[int] = None):
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max(1, int(max_entries))
+        self.max_rows = max(1, int(max_rows)) if max_rows is not None else 16 * self.max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._mem: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()  # key -> (value, created_at)
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                self._open_db(path)
+            except Exception:
+                # Persistence is optional; fall back to a purely in-memory cache
+                self._db = None
+
+    def _open_db(self, path: str) -> None:
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._prune(db)
+        db.commit()
+        self._db = db
+
+    def _prune(self, db: sqlite3.Connection) -> None:
+        """Drop expired rows and all but the newest max_rows; caller commits."""
+        if self.ttl is not None:
+            db.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,))
+        db.execute(
+            f"DELETE FROM {self.table} WHERE key IN "
+            f"(SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        # Memory hits skip the lock so concurrent readers don't queue up behind each other.
+        # This relies on CPython's GIL: OrderedDict.get/move_to_end are single C-level calls
+        # and can't interleave with the popitem in _remember. Free-threaded (no-GIL) builds
+        # need this path back under self._lock.
+        hit = self._mem.get(key)
+        if hit is not None:
+            if self._expired(hit[1]):
+                with self._lock:
+                    # Evict now rather than leaving the stale entry to age out of the LRU;
+                    # re-check in case a writer refreshed it in the meantime
+                    current = self._mem.get(key)
+                    if current is not None and self._expired(current[1]):
+                        del self._mem[key]
+                return default
+            try:
+                self._mem.move_to_end(key)
+            except KeyError:
+                pass  # evicted by a concurrent insert in the meantime
+            return hit[0]
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is None and self._db is not None:
+                try:
+                    row = self._db.execute(
+                        f"SELECT value, created_at FROM {self.table} WHERE key = ?", (_db_key(key),)
+                    ).fetchone()
+                except Exception:
+                    row = None
+                if row is not None:
+                    hit = (json.loads(row[0]), row[1])
+                    self._remember(key, *hit)
+            if hit is None:
+                return default
+            if self._expired(hit[1]):
+                self._mem.pop(key, None)
+                return default
+            return hit[0]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, (str, tuple)) and self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)",
+                        (_db_key(key), json.dumps(value), now),
+                    )
+                    self._writes += 1
+                    if self._writes % _PRUNE_EVERY == 0:
+                        self._prune(self._db)
+                    self._db.commit()
+                except Exception:
+                    pass
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        existing = self.get(key, _MISSING)
+        if existing is not _MISSING:
+            return existing
+        self[key] = value
+        return value
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and created_at < time.time() - self.ttl
+
+    def _remember(self, key: Hashable, value: Any, created_at: float) -> None:
+        """Put an entry in the memory tier; caller holds the lock."""
+        self._mem[key] = (value, created_at)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+
+def _db_key(key: Hashable) -> str:
+    return key if isinstance(key, str) else json.dumps(key)
+
+
+_MISSING = object()
+_PRUNE_EVERY = 256  # writes between table prunes
@@ -1,18 +1,74 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import re
 import os
+import json
+import threading
 import numpy as np
 import hashlib
+import importlib
+import importlib.util
+import asyncio
+import multiprocessing
+import sys
 
 import fitz  # PyMuPDF
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
+
+class _DeferredModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    importlib.util.LazyLoader runs the deferred module body inside attribute access
+    without a lock, so two threads touching the module first (e.g. parallel TTS
+    segments) could see it half-initialized. import_module under a lock goes through the
+    regular import machinery instead, which makes other threads wait for the import.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        # Only reached for names not set in __init__
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<deferred module {self._name!r}>"
+
+
+def lazy_import(name: str):
+    """Return module `name` with its import deferred until first attribute access.
+
+    The SDKs pulled in for Gemini take most of a second to import, which every cold
+    start paid even when no request ever touched them. Returns None (like the old
+    try/except ImportError guards) when the package is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.loader is None:
+        return None
+    return _DeferredModule(name)
+
+
+genai = lazy_import("google.generativeai")
 
 
 # Cache for API client
@@ -29,6 +85,28 @@ def _ensure_genai_configured():
             _GENAI_CONFIGURED = True
 
 
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_features(token: str, dim: int) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Hashed buckets (and weights) one token contributes to a SimpleTfidfEmbedder vector.
+
+    Vocabulary repeats heavily across chunks, so memoizing skips the md5 calls for
+    every token (and its bigrams) after the first time it is seen.
+    """
+    # Hash token to dimension
+    idxs = [int(hashlib.md5(token.encode()).hexdigest(), 16) % dim]
+    weights = [1.0]
+    # Also add bigrams for better context
+    if len(token) > 3:
+        for i in range(len(token) - 1):
+            bigram = token[i:i+2]
+            idxs.append(int(hashlib.md5(bigram.encode()).hexdigest(), 16) % dim)
+            weights.append(0.5)
+    return tuple(idxs), tuple(weights)
+
+
 class SimpleTfidfEmbedder:
     """Ultra-lightweight TF-IDF based embedder (fallback when API unavailable)
     
@@ -44,26 +122,16 @@ class SimpleTfidfEmbedder:
         
     def _hash_features(self, text: str) -> np.ndarray:
         """Create a simple feature vector using hashing trick"""
-        # Tokenize
-        tokens = re.findall(r'\b\w+\b', text.lower())
-        
-        # Create sparse vector using hashing
-        vector = np.zeros(self.dim, dtype=np.float32)
-        for token in tokens:
-            # Hash token to dimension
-            hash_val = int(hashlib.md5(token.encode()).hexdigest(), 16)
-            idx = hash_val % self.dim
-            vector[idx] += 1.0
-            
-            # Also add bigrams for better context
-            if len(token) > 3:
-                for i in range(len(token) - 1):
-                    bigram = token[i:i+2]
-                    hash_val = int(hashlib.md5(bigram.encode()).hexdigest(), 16)
-                    idx = hash_val % self.dim
-                    vector[idx] += 0.5
-        
-        return vector
+        # Gather (bucket, weight) pairs for all tokens, then sum them in one bincount
+        idxs: List[int] = []
+        weights: List[float] = []
+        for token in _TOKEN_RE.findall(text.lower()):
+            token_idxs, token_weights = _token_features(token, self.dim)
+            idxs.extend(token_idxs)
+            weights.extend(token_weights)
+        if not idxs:
+            return np.zeros(self.dim, dtype=np.float32)
+        return np.bincount(idxs, weights=weights, minlength=self.dim).astype(np.float32)
         
     def encode(self, texts: List[str], convert_to_numpy: bool = True, normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
         """Encode texts into embeddings"""
@@ -158,6 +226,139 @@ def _get_embedder(model_name: str = "models/text-embedding-004") -> GeminiEmbedd
     return _EMBEDDER
 
 
+def _embedder_tag() -> str:
+    """Identify which embedding space vectors come from (cached vectors must match it)."""
+    model = _get_embedder()
+    if model.use_fallback or genai is None:
+        return f"tfidf-{model.fallback.dim}"
+    return model.model_name
+
+
+# Query embedding cache keyed by (embedding space, sha256(text)): long page texts used as
+# queries by /insights don't sit in memory as keys, and hot queries skip the encode call
+_QUERY_EMB_CACHE: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+_QUERY_EMB_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "4096"))
+_QUERY_EMB_LOCK = threading.Lock()
+
+
+def embed_query(text: str) -> np.ndarray:
+    """Embed a single query string (unit-normalized), memoized per (embedding space, text).
+
+    The returned array is shared with the cache and read-only.
+    """
+    return embed_queries([text])[0]
+
+
+def embed_queries(texts: List[str]) -> List[np.ndarray]:
+    """Embed several query strings, encoding all cache misses in a single provider call."""
+    texts = [t.strip() for t in texts]
+    tag = _embedder_tag()
+    digests = [hashlib.sha256(t.encode("utf-8")).hexdigest() for t in texts]
+    out: List[Optional[np.ndarray]] = [None] * len(texts)
+    with _QUERY_EMB_LOCK:
+        for i, digest in enumerate(digests):
+            hit = _QUERY_EMB_CACHE.get((tag, digest))
+            if hit is not None:
+                _QUERY_EMB_CACHE.move_to_end((tag, digest))
+                out[i] = hit
+    misses = list(dict.fromkeys(t for t, v in zip(texts, out) if v is None))
+    if not misses:
+        return out  # type: ignore[return-value]
+    model = _get_embedder()
+    vecs = np.asarray(model.encode(misses, convert_to_numpy=True, normalize_embeddings=True), dtype=np.float32)
+    # Re-read the tag: the first encode may have switched the embedder to its fallback
+    tag = _embedder_tag()
+    fresh: Dict[str, np.ndarray] = {}
+    with _QUERY_EMB_LOCK:
+        for t, vec in zip(misses, vecs):
+            vec.setflags(write=False)
+            fresh[t] = vec
+            _QUERY_EMB_CACHE[(tag, hashlib.sha256(t.encode("utf-8")).hexdigest())] = vec
+        while len(_QUERY_EMB_CACHE) > _QUERY_EMB_CACHE_SIZE:
+            _QUERY_EMB_CACHE.popitem(last=False)
+    return [v if v is not None else fresh[t] for t, v in zip(texts, out)]
+
+
+class _QueryBatcher:
+    """Coalesce query embeddings requested by concurrent handlers into one encode call.
+
+    When the encoder is idle a request is sent right away, so a lone query doesn't wait
+    out the batching window. While a batch is encoding, new requests queue up and are
+    flushed together when it finishes, after `window` seconds, or once `max_batch` are
+    queued, whichever comes first; encodes run on a worker thread, so the event loop
+    never blocks on the embedding provider. A text that is already queued or being
+    encoded joins the existing future instead of being encoded again by a later batch.
+    """
+
+    def __init__(self, max_batch: int = 32, window: float = 0.005):
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: List[Tuple[str, "asyncio.Future[np.ndarray]"]] = []
+        self._inflight: Dict[str, "asyncio.Future[np.ndarray]"] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = 0  # batches currently encoding
+
+    async def embed(self, text: str) -> np.ndarray:
+        text = text.strip()
+        fut = self._inflight.get(text)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._inflight[text] = fut
+            fut.add_done_callback(lambda f, t=text: self._inflight.pop(t, None) if self._inflight.get(t) is f else None)
+            self._pending.append((text, fut))
+            if len(self._pending) >= self.max_batch or self._running == 0:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        # Shielded: one cancelled waiter must not cancel the result for the others
+        return await asyncio.shield(fut)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._running += 1
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[str, "asyncio.Future[np.ndarray]"]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            vecs = await loop.run_in_executor(None, embed_queries, [t for t, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        finally:
+            self._running -= 1
+            # Whatever queued up during this encode goes out now rather than at the timer
+            if self._running == 0 and self._pending:
+                self._flush()
+        for (_, fut), vec in zip(batch, vecs):
+            if not fut.done():
+                fut.set_result(vec)
+
+
+_QUERY_BATCHER = _QueryBatcher(
+    max_batch=int(os.getenv("EMBED_BATCH_MAX", "32")),
+    window=float(os.getenv("EMBED_BATCH_WINDOW_MS", "5")) / 1000.0,
+)
+
+
+async def embed_query_async(text: str) -> np.ndarray:
+    """Async embed_query: cache hits return immediately, misses are micro-batched."""
+    key = (_embedder_tag(), hashlib.sha256(text.strip().encode("utf-8")).hexdigest())
+    with _QUERY_EMB_LOCK:
+        hit = _QUERY_EMB_CACHE.get(key)
+        if hit is not None:
+            _QUERY_EMB_CACHE.move_to_end(key)
+            return hit
+    return await _QUERY_BATCHER.embed(text)
+
+
 def _split_paragraphs(text: str) -> List[str]:
     """Split text into paragraphs using blank lines as separators."""
     # Normalize line breaks and split on blank lines
@@ -294,7 +495,225 @@ def _sections_from_toc(doc: fitz.Document) -> Optional[List[Dict[str, Any]]]:
     return sections or None
 
 
+# Content-addressed cache of process_pdf output: on disk a float32 .npy of the chunk
+# embeddings plus a .json sidecar (embedder tag + chunk metadata) per PDF, and a small
+# in-memory LRU. The .npy is opened memory-mapped, so a restart maps the vectors instead
+# of reading and decoding them, and the OS pages rows in as the store copies them.
+_PDF_CACHE_DIR = Path(os.getenv("PDF_CACHE_DIR") or (Path(__file__).resolve().parent / "cache"))
+_PDF_MEM_CACHE: "OrderedDict[Tuple[str, str], List[Dict[str, Any]]]" = OrderedDict()
+_PDF_MEM_CACHE_SIZE = 32
+_PDF_CACHE_LOCK = threading.Lock()
+
+
+def _pdf_cache_get(key: str, tag: str) -> Optional[List[Dict[str, Any]]]:
+    with _PDF_CACHE_LOCK:
+        hit = _PDF_MEM_CACHE.get((key, tag))
+        if hit is not None:
+            _PDF_MEM_CACHE.move_to_end((key, tag))
+            return hit
+    meta_path = _PDF_CACHE_DIR / f"{key}.json"
+    if not meta_path.is_file():
+        return _pdf_cache_get_legacy(key, tag)
+    try:
+        sidecar = json.loads(meta_path.read_text(encoding="utf-8"))
+        if sidecar.get("tag") != tag:
+            return None
+        meta = sidecar["chunks"]
+        embeddings = np.load(_PDF_CACHE_DIR / f"{key}.npy", mmap_mode="r") if meta else np.empty((0, 0), dtype=np.float32)
+    except Exception:
+        return None
+    if embeddings.shape[0] != len(meta):
+        return None
+    # Each embedding is a read-only row view into the mapping
+    results = [{**m, "embedding": emb} for m, emb in zip(meta, embeddings)]
+    _pdf_cache_remember(key, tag, results)
+    return results
+
+
+def _pdf_cache_get_legacy(key: str, tag: str) -> Optional[List[Dict[str, Any]]]:
+    """Read a cache entry written in the older single-.npz format (no re-embed after upgrade)."""
+    path = _PDF_CACHE_DIR / f"{key}.npz"
+    if not path.is_file():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            if str(z["tag"]) != tag:
+                return None
+            embeddings = z["embeddings"]
+            meta = json.loads(str(z["meta"]))
+    except Exception:
+        return None
+    results: List[Dict[str, Any]] = []
+    for m, emb in zip(meta, embeddings):
+        results.append({**m, "embedding": emb.tolist()})
+    _pdf_cache_remember(key, tag, results)
+    return results
+
+
+def _pdf_cache_remember(key: str, tag: str, results: List[Dict[str, Any]]) -> None:
+    with _PDF_CACHE_LOCK:
+        _PDF_MEM_CACHE[(key, tag)] = results
+        _PDF_MEM_CACHE.move_to_end((key, tag))
+        while len(_PDF_MEM_CACHE) > _PDF_MEM_CACHE_SIZE:
+            _PDF_MEM_CACHE.popitem(last=False)
+
+
+def _pdf_cache_put(key: str, tag: str, results: List[Dict[str, Any]]) -> None:
+    _pdf_cache_remember(key, tag, results)
+    try:
+        _PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        meta = [{k: v for k, v in r.items() if k != "embedding"} for r in results]
+        if results:
+            embeddings = np.asarray([r["embedding"] for r in results], dtype=np.float32)
+            vec_path = _PDF_CACHE_DIR / f"{key}.npy"
+            tmp = _PDF_CACHE_DIR / f"{key}.tmp.npy"
+            out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=embeddings.shape)
+            out[:] = embeddings
+            out.flush()
+            del out
+            os.replace(tmp, vec_path)
+        # The sidecar goes last: its presence marks the entry as complete
+        meta_path = _PDF_CACHE_DIR / f"{key}.json"
+        tmp_meta = _PDF_CACHE_DIR / f"{key}.tmp.json"
+        tmp_meta.write_text(json.dumps({"tag": tag, "chunks": meta}), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+    except Exception:
+        # Cache is best-effort; never fail processing because of it
+        pass
+
+
 def process_pdf(file_path: str, max_chars: int = 800, overlap: int = 100) -> List[Dict[str, Any]]:
+    """Process a PDF, memoized on its content hash.
+
+    Identical bytes (re-uploads, restarts) reuse the stored chunks and embeddings
+    instead of re-parsing and re-embedding. See _process_pdf_uncached for the output format.
+    """
+    path = Path(file_path)
+    if not path.is_file():
+        raise FileNotFoundError(f"PDF not found: {file_path}")
+    pdf_bytes = path.read_bytes()
+    digest = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+    key = f"{digest}-{max_chars}-{overlap}"
+    cached = _pdf_cache_get(key, _embedder_tag())
+    if cached is not None:
+        return cached
+    # Parse from the bytes already in memory rather than reading the file a second time
+    results = _process_pdf_uncached(file_path, max_chars=max_chars, overlap=overlap, pdf_bytes=pdf_bytes)
+    # Tag after embedding: the embedder may have switched to its fallback during encode
+    _pdf_cache_put(key, _embedder_tag(), results)
+    return results
+
+
+# Text extraction is CPU-bound PyMuPDF work that holds the GIL, so a batch of uncached
+# PDFs is parsed across processes; only the embed call that follows is serialized.
+_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+_PARSE_POOL_FAILED = False  # set once the pool breaks; later batches parse inline
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        # spawn: forking a server process that already runs threads is not safe
+        _PARSE_POOL = ProcessPoolExecutor(max_workers=_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _PARSE_POOL
+
+
+def _extract_many(jobs: List[Tuple[int, str, str, bytes]], max_chars: int, overlap: int) -> List[Optional[List[Dict[str, Any]]]]:
+    """Extract chunks for each (position, key, path, bytes) job; None where a file fails."""
+    global _PARSE_POOL, _PARSE_POOL_FAILED
+    if len(jobs) > 1 and _PARSE_WORKERS > 1 and not _PARSE_POOL_FAILED:
+        try:
+            pool = _get_parse_pool()
+            # Ship the bytes that were hashed for the cache key, so the chunks always
+            # match the key even if the file changes on disk in the meantime
+            futures = [pool.submit(_extract_pdf_chunks, path, max_chars, overlap, pdf_bytes) for _, _, path, pdf_bytes in jobs]
+            out: List[Optional[List[Dict[str, Any]]]] = []
+            for fut in futures:
+                try:
+                    out.append(fut.result())
+                except BrokenProcessPool:
+                    raise
+                except Exception:
+                    out.append(None)
+            return out
+        except Exception as e:
+            print(f"[process_pdfs] parallel parse unavailable ({type(e).__name__}), parsing inline from now on")
+            _PARSE_POOL_FAILED = True
+            if _PARSE_POOL is not None:
+                # Reap the spawned workers rather than leaking them with the pool
+                _PARSE_POOL.shutdown(wait=False, cancel_futures=True)
+                _PARSE_POOL = None
+    results: List[Optional[List[Dict[str, Any]]]] = []
+    for _, _, path, pdf_bytes in jobs:
+        try:
+            results.append(_extract_pdf_chunks(path, max_chars=max_chars, overlap=overlap, pdf_bytes=pdf_bytes))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def process_pdfs(file_paths: List[str], max_chars: int = 800, overlap: int = 100) -> List[List[Dict[str, Any]]]:
+    """Process several PDFs, embedding all uncached chunks with a single encode call.
+
+    Returns one result list per input path (same order). Files that fail to parse yield [].
+    """
+    tag = _embedder_tag()
+    outputs: List[List[Dict[str, Any]]] = [[] for _ in file_paths]
+    to_parse: List[Tuple[int, str, str, bytes]] = []  # (position, cache key, path, bytes)
+
+    def load(file_path: str) -> Optional[Tuple[str, bytes]]:
+        try:
+            pdf_bytes = Path(file_path).read_bytes()
+        except Exception:
+            return None
+        return f"{hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()}-{max_chars}-{overlap}", pdf_bytes
+
+    # File reads and hashing release the GIL, so a library of PDFs loads in parallel
+    if len(file_paths) > 1 and _PARSE_WORKERS > 1:
+        with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as ex:
+            loaded = list(ex.map(load, file_paths))
+    else:
+        loaded = [load(p) for p in file_paths]
+    for pos, (file_path, item) in enumerate(zip(file_paths, loaded)):
+        if item is None:
+            continue
+        key, pdf_bytes = item
+        cached = _pdf_cache_get(key, tag)
+        if cached is not None:
+            outputs[pos] = cached
+            continue
+        to_parse.append((pos, key, file_path, pdf_bytes))
+
+    pending: List[Tuple[int, str, List[Dict[str, Any]]]] = []  # (position, cache key, chunks)
+    for (pos, key, _, _), chunks in zip(to_parse, _extract_many(to_parse, max_chars, overlap)):
+        if chunks is not None:
+            pending.append((pos, key, chunks))
+    if not pending:
+        return outputs
+
+    all_chunks = [c for _, _, chunks in pending for c in chunks]
+    embedded = _embed_chunks(all_chunks)
+    tag = _embedder_tag()
+    offset = 0
+    for pos, key, chunks in pending:
+        results = embedded[offset:offset + len(chunks)]
+        offset += len(chunks)
+        _pdf_cache_put(key, tag, results)
+        outputs[pos] = results
+    return outputs
+
+
+def _embed_chunks(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach embeddings to extracted chunks using one encode call for the whole list."""
+    if not chunks:
+        return []
+    model = _get_embedder()
+    embeddings = model.encode([c["text_chunk"] for c in chunks], convert_to_numpy=True, normalize_embeddings=True)
+    return [{**c, "embedding": emb.tolist()} for c, emb in zip(chunks, embeddings)]
+
+
+def _process_pdf_uncached(file_path: str, max_chars: int = 800, overlap: int = 100, pdf_bytes: Optional[bytes] = None) -> List[Dict[str, Any]]:
     """Process a PDF into section embeddings when possible (heading + following content).
 
     Falls back to paragraph chunking if headings cannot be detected.
@@ -303,16 +722,27 @@ def process_pdf(file_path: str, max_chars: int = 800, overlap: int = 100) -> Lis
         file_path: Path to a PDF file.
         max_chars: Not used for sectioning; used for fallback chunking.
         overlap: Overlap for fallback chunking.
+        pdf_bytes: Optional file contents already read by the caller; parsed in memory when given.
 
     Returns:
-        A list of dicts: { "text_chunk": str, "embedding": List[float], "page_number": int, "section_title"?: str, "section_index"?: int }
+        A list of dicts: { "text_chunk": str, "embedding": List[float] | np.ndarray, "page_number": int, "section_title"?: str, "section_index"?: int }
         page_number is 1-based (first page where section starts).
     """
-    path = Path(file_path)
-    if not path.is_file():
-        raise FileNotFoundError(f"PDF not found: {file_path}")
+    return _embed_chunks(_extract_pdf_chunks(file_path, max_chars=max_chars, overlap=overlap, pdf_bytes=pdf_bytes))
+
+
+def _extract_pdf_chunks(file_path: str, max_chars: int = 800, overlap: int = 100, pdf_bytes: Optional[bytes] = None) -> List[Dict[str, Any]]:
+    """Parse a PDF into sections (or paragraph chunks) without embedding them.
 
-    doc = fitz.open(path)
+    Same output as _process_pdf_uncached minus the "embedding" key.
+    """
+    if pdf_bytes is not None:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    else:
+        path = Path(file_path)
+        if not path.is_file():
+            raise FileNotFoundError(f"PDF not found: {file_path}")
+        doc = fitz.open(path, filetype="pdf")
     try:
         # First pass: try to extract sections using TOC if present; else use heading heuristics
         sections: Optional[List[Dict[str, Any]]] = _sections_from_toc(doc)
@@ -355,8 +785,7 @@ def process_pdf(file_path: str, max_chars: int = 800, overlap: int = 100) -> Lis
 
         if not sections:
             # Fallback: paragraph chunking
-            texts: List[str] = []
-            meta: List[Dict[str, Any]] = []
+            chunks: List[Dict[str, Any]] = []
             for page_index in range(len(doc)):
                 page = doc[page_index]
                 text = page.get_text("text") or ""
@@ -364,34 +793,20 @@ def process_pdf(file_path: str, max_chars: int = 800, overlap: int = 100) -> Lis
                     continue
                 for para in _split_paragraphs(text):
                     for chunk in _chunk_text(para, max_chars=max_chars, overlap=overlap):
-                        texts.append(chunk)
-                        meta.append({"page_number": page_index + 1})
-            if not texts:
-                return []
-            model = _get_embedder()
-            embeddings = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
-            results: List[Dict[str, Any]] = []
-            for chunk, emb, m in zip(texts, embeddings, meta):
-                results.append({
-                    "text_chunk": chunk,
-                    "embedding": emb.tolist(),
-                    "page_number": m["page_number"],
-                })
-            return results
-
-        # Embed sections
-        texts = [s.get("text", "") for s in sections]
-        model = _get_embedder()
-        embeddings = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
-        results: List[Dict[str, Any]] = []
-        for idx, (sec, emb) in enumerate(zip(sections, embeddings)):
-            results.append({
+                        chunks.append({
+                            "text_chunk": chunk,
+                            "page_number": page_index + 1,
+                        })
+            return chunks
+
+        chunks = []
+        for idx, sec in enumerate(sections):
+            chunks.append({
                 "text_chunk": sec.get("text", ""),
-                "embedding": emb.tolist(),
                 "page_number": int(sec.get("page") or 1),
                 "section_title": sec.get("title") or None,
                 "section_index": idx,
             })
-        return results
+        return chunks
     finally:
         doc.close()
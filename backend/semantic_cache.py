@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+class SemanticCache:
+    """A small two-tier response cache for query endpoints.
+
+    Tier 1 is an exact-match LRU keyed by (query text, scope).
+    Tier 2 matches by query embedding: a cached response is reused when the cosine
+    similarity with a previous query in the same scope is >= threshold.
+
+    `scope` captures everything besides the query that affects the response
+    (request params, store size, ...) so entries never leak across requests.
+    Embeddings are expected to be unit-normalized, so cosine is a plain dot product.
+
+    When `path` is given, entries are written through to a SQLite file and the most
+    recent ones are reloaded on startup, so the cache survives restarts. Scopes and
+    values must then be JSON-serializable.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024, path: Optional[str] = None):
+        self.threshold = threshold
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._exact: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # Semantic tier: preallocated ring buffer of embeddings with parallel scope/value slots
+        self._emb: Optional[np.ndarray] = None
+        self._scope_ids = np.zeros(self.max_entries, dtype=np.int64)
+        self._scopes: List[Optional[Hashable]] = [None] * self.max_entries
+        self._values: List[Any] = [None] * self.max_entries
+        self._size = 0
+        self._next = 0  # FIFO eviction pointer
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                self._open_db(path)
+            except Exception:
+                # Persistence is optional; fall back to a purely in-memory cache
+                self._db = None
+
+    def _open_db(self, path: str) -> None:
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, query TEXT NOT NULL, scope TEXT NOT NULL, "
+            "embedding BLOB, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        db.commit()
+        rows = db.execute(
+            "SELECT query, scope, embedding, response FROM entries ORDER BY id DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        # Replay oldest-first so FIFO/LRU order matches insertion order
+        for query, scope_json, emb_blob, response in reversed(rows):
+            scope = _scope_from_json(scope_json)
+            embedding = np.frombuffer(emb_blob, dtype=np.float32) if emb_blob is not None else None
+            self._insert(query, embedding, scope, json.loads(response))
+        self._db = db
+
+    def get_exact(self, query: str, scope: Hashable) -> Optional[Any]:
+        key = (query, scope)
+        # No lock, so hits never contend. This relies on CPython's GIL: get/move_to_end are
+        # single C-level calls that can't interleave with the popitem in _insert. Free-threaded
+        # (no-GIL) builds need this read back under self._lock.
+        value = self._exact.get(key)
+        if value is not None:
+            try:
+                self._exact.move_to_end(key)
+            except KeyError:
+                pass  # evicted concurrently; the value we read is still valid
+        return value
+
+    def get(self, embedding: np.ndarray, scope: Hashable) -> Optional[Any]:
+        q = np.asarray(embedding, dtype=np.float32).ravel()
+        with self._lock:
+            if self._emb is None or self._size == 0 or self._emb.shape[1] != q.shape[0]:
+                return None
+            # Only score entries cached under the same request signature; after an upload
+            # bumps the store size, stale-scope rows are skipped instead of multiplied
+            rows = np.flatnonzero(self._scope_ids[: self._size] == hash(scope))
+            if rows.size == 0:
+                return None
+            scores = self._emb[rows] @ q
+            j = int(np.argmax(scores))
+            i = int(rows[j])
+            if scores[j] >= self.threshold and self._scopes[i] == scope:
+                return self._values[i]
+            return None
+
+    def put(self, query: str, embedding: Optional[np.ndarray], scope: Hashable, value: Any) -> None:
+        with self._lock:
+            self._insert(query, embedding, scope, value)
+            if self._db is not None:
+                self._persist(query, embedding, scope, value)
+
+    def _persist(self, query: str, embedding: Optional[np.ndarray], scope: Hashable, value: Any) -> None:
+        try:
+            blob = np.asarray(embedding, dtype=np.float32).ravel().tobytes() if embedding is not None else None
+            cur = self._db.execute(
+                "INSERT INTO entries (query, scope, embedding, response, created_at) VALUES (?, ?, ?, ?, ?)",
+                (query, json.dumps(scope), blob, json.dumps(value), int(time.time())),
+            )
+            # Keep the table bounded to roughly what fits in memory
+            self._db.execute("DELETE FROM entries WHERE id <= ?", (cur.lastrowid - self.max_entries,))
+            self._db.commit()
+        except Exception:
+            pass
+
+    def _insert(self, query: str, embedding: Optional[np.ndarray], scope: Hashable, value: Any) -> None:
+        """Add an entry to both tiers; caller holds the lock (or is still constructing)."""
+        key = (query, scope)
+        self._exact[key] = value
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+        if embedding is None:
+            return
+        q = np.asarray(embedding, dtype=np.float32).ravel()
+        if self._emb is None or self._emb.shape[1] != q.shape[0]:
+            # First entry or embedder dimension changed: start a fresh semantic tier
+            self._emb = np.zeros((self.max_entries, q.shape[0]), dtype=np.float32)
+            self._size = 0
+            self._next = 0
+        i = self._next
+        self._emb[i] = q
+        self._scope_ids[i] = hash(scope)
+        self._scopes[i] = scope
+        self._values[i] = value
+        self._next = (i + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._exact.clear()
+            self._emb = None
+            self._scopes = [None] * self.max_entries
+            self._values = [None] * self.max_entries
+            self._size = 0
+            self._next = 0
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM entries")
+                    self._db.commit()
+                except Exception:
+                    pass
+
+
+def _scope_from_json(raw: str) -> Hashable:
+    """Scopes are tuples in memory; JSON round-trips them as (nested) lists."""
+    def to_tuple(v: Any) -> Any:
+        return tuple(to_tuple(x) for x in v) if isinstance(v, list) else v
+    return to_tuple(json.loads(raw))
@@ -48,6 +48,21 @@ def get_port():
     logger.info(f"🔌 Using port: {port}")
     return port
 
+def get_server_impl():
+    """Pick the C-accelerated event loop / HTTP parser when installed (uvicorn[standard])."""
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    logger.info(f"⚡ Event loop: {loop}, HTTP parser: {http}")
+    return loop, http
+
 def main():
     try:
         logger.info("=" * 50)
@@ -63,6 +78,11 @@ def main():
         # Get port
         port = get_port()
         
+        loop, http = get_server_impl()
+        # Single worker: the vector store and caches live in process memory.
+        # reload and multiple workers are mutually exclusive in uvicorn anyway.
+        reload = os.getenv("DEV") == "1"
+        
         # Start uvicorn immediately - don't pre-import app as it's slow
         logger.info(f"🎯 Starting Uvicorn on 0.0.0.0:{port}")
         logger.info("=" * 50)
@@ -73,6 +93,9 @@ def main():
             host="0.0.0.0",
             port=int(port),
             workers=1,
+            loop=loop,
+            http=http,
+            reload=reload,
             log_level="info",
             access_log=True,
             timeout_keep_alive=30
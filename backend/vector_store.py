@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import os
 
 import numpy as np
@@ -17,14 +17,31 @@ class VectorStore:
         self.index: Optional[faiss.Index] = None
         self.dim: Optional[int] = None
         self.metric: str = "ip"  # 'ip' or 'l2'
-        # Index type from env: 'flat' (default) or 'hnsw'
+        # Index type from env: 'flat' (default), 'hnsw', 'fp16' (half-precision flat) or
+        # 'sq8' (int8-quantized flat)
         self.index_type = (os.getenv("VECTOR_INDEX") or "flat").lower().strip()
         self.hnsw_M = int(os.getenv("HNSW_M", "32"))
         self.hnsw_efSearch = int(os.getenv("HNSW_EF_SEARCH", "64"))
+        # Below this many vectors an exact scan beats walking the HNSW graph
+        self.hnsw_exact_below = int(os.getenv("HNSW_EXACT_BELOW", "1000"))
         if dim is not None:
             self._create_index(dim)
         self.texts: List[str] = []
         self.metadatas: List[Dict[str, Any]] = []
+        # Structure-of-arrays view of the hot metadata fields, one entry per row, so
+        # filters run as vectorized numpy masks instead of dict lookups per chunk.
+        # file_ids index into file_names (-1: no filename); section_ids use -1 for none.
+        self.file_names: List[str] = []
+        self._file_codes: Dict[str, int] = {}
+        self.file_ids = np.empty(0, dtype=np.int32)
+        self.page_numbers = np.empty(0, dtype=np.int32)
+        self.section_ids = np.empty(0, dtype=np.int32)
+        # Row ids per file (ascending), kept in sync by add_documents
+        self._file_rows: Dict[str, np.ndarray] = {}
+        # (filename, page_number) -> joined chunk text; cleared whenever documents are added
+        self._page_text_cache: Dict[Tuple[str, Optional[int]], str] = {}
+        # filename -> {page_number: row ids}, built on first use per file; cleared likewise
+        self._page_rows_cache: Dict[str, Dict[int, np.ndarray]] = {}
 
     def _create_index(self, dim: int) -> None:
         # We normalize embeddings upstream, so cosine search is equivalent to IP or L2.
@@ -38,6 +55,23 @@ class VectorStore:
             except Exception:
                 pass
             self.metric = "l2"
+        elif self.index_type == "sq8":
+            # int8 codes (1 byte/dim, 4x smaller than float32) scanned with inner product.
+            # Training on the two corner vectors fixes the quantizer range to [-1, 1], which
+            # covers every unit-normalized embedding, so no data-dependent training is needed.
+            self.index = faiss.IndexScalarQuantizer(
+                dim, faiss.ScalarQuantizer.QT_8bit_uniform, faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.train(np.stack([-np.ones(dim), np.ones(dim)]).astype(np.float32))
+            self.metric = "ip"
+        elif self.index_type == "fp16":
+            # float16 codes: half the bytes per scan of flat float32 (FAISS decodes them with
+            # SIMD). Unit-normalized components sit well within fp16's ~3-digit precision,
+            # so rankings match flat except for near-exact ties. No training needed.
+            self.index = faiss.IndexScalarQuantizer(
+                dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+            )
+            self.metric = "ip"
         else:
             # Exact cosine via inner product on normalized vectors
             self.index = faiss.IndexFlatIP(dim)
@@ -58,72 +92,202 @@ class VectorStore:
 
         Returns the number of vectors added.
         """
-        if not processed_docs:
+        return self.add_many([(filename, processed_docs)])
+
+    def add_many(self, batches: List[Tuple[Optional[str], List[Dict[str, Any]]]]) -> int:
+        """Add several files' processed docs at once, as (filename, processed_docs) pairs.
+
+        Same result as calling add_documents per file, but with a single index.add and one
+        concatenation per metadata column, so bulk indexing doesn't grow the columns (and
+        re-copy them) once per file.
+
+        Returns the number of vectors added.
+        """
+        batches = [(filename, docs) for filename, docs in batches if docs]
+        if not batches:
             return 0
 
         embeddings = np.ascontiguousarray(
-            np.array([d["embedding"] for d in processed_docs], dtype=np.float32)
+            np.array([d["embedding"] for _, docs in batches for d in docs], dtype=np.float32)
         )
         self._ensure_index(embeddings.shape[1])
 
         self.index.add(embeddings)
+        self._page_text_cache.clear()
+        self._page_rows_cache.clear()
 
-        for d in processed_docs:
-            text = d.get("text_chunk", "")
-            page_number = int(d.get("page_number", 0))
-            meta = {
-                "page_number": page_number,
-            }
+        file_codes: List[np.ndarray] = []
+        pages: List[int] = []
+        sections: List[int] = []
+        for filename, processed_docs in batches:
+            first_row = len(self.texts)
+            if filename and filename not in self._file_codes:
+                self._file_codes[filename] = len(self.file_names)
+                self.file_names.append(filename)
+            file_code = self._file_codes[filename] if filename else -1
+            for d in processed_docs:
+                text = d.get("text_chunk", "")
+                page_number = int(d.get("page_number", 0))
+                meta = {
+                    "page_number": page_number,
+                }
+                if filename:
+                    meta["filename"] = filename
+                # Optional section metadata from processing
+                if "section_title" in d:
+                    meta["section_title"] = d.get("section_title")
+                if "section_index" in d:
+                    meta["section_index"] = d.get("section_index")
+                pages.append(page_number)
+                sec = d.get("section_index")
+                sections.append(int(sec) if sec is not None else -1)
+                self.texts.append(text)
+                self.metadatas.append(meta)
+
+            n = len(processed_docs)
+            file_codes.append(np.full(n, file_code, dtype=np.int32))
             if filename:
-                meta["filename"] = filename
-            # Optional section metadata from processing
-            if "section_title" in d:
-                meta["section_title"] = d.get("section_title")
-            if "section_index" in d:
-                meta["section_index"] = d.get("section_index")
-            self.texts.append(text)
-            self.metadatas.append(meta)
+                new_rows = np.arange(first_row, first_row + n, dtype=np.int64)
+                prev = self._file_rows.get(filename)
+                self._file_rows[filename] = new_rows if prev is None else np.concatenate([prev, new_rows])
+
+        self.file_ids = np.concatenate([self.file_ids, *file_codes])
+        self.page_numbers = np.concatenate([self.page_numbers, np.asarray(pages, dtype=np.int32)])
+        self.section_ids = np.concatenate([self.section_ids, np.asarray(sections, dtype=np.int32)])
 
         return embeddings.shape[0]
 
-    def search(self, query_embedding: List[float] | np.ndarray, k: int = 5, fetch_k: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Search for the top-k most similar chunks given a query embedding.
+    def indexed_files(self) -> Set[str]:
+        """Filenames that have at least one chunk in the store."""
+        return set(self._file_rows)
 
-        Uses inner product on normalized vectors (i.e., cosine similarity).
-        Returns a list of dicts with: text, metadata, score, distance (1 - score)
+    def file_code(self, filename: str) -> int:
+        """Index of filename in file_names (the value stored in file_ids), or -1."""
+        return self._file_codes.get(filename, -1)
+
+    def filename_at(self, row: int) -> Optional[str]:
+        """Filename of one row, read from the file_ids column (None for unnamed uploads)."""
+        code = int(self.file_ids[row])
+        return self.file_names[code] if code >= 0 else None
+
+    def page_keys(self, row_ids: np.ndarray) -> np.ndarray:
+        """One int64 per row packing (file id, page number), for int-set / np.unique de-dup."""
+        files = self.file_ids[row_ids].astype(np.int64) + 1
+        return (files << 32) | (self.page_numbers[row_ids].astype(np.int64) & 0xFFFFFFFF)
+
+    def section_keys(self, row_ids: np.ndarray) -> np.ndarray:
+        """Like page_keys but also packing the section id, 21 bits per field.
+
+        Exact while files, sections and pages each stay below ~2M, far above real use.
         """
+        mask = (1 << 21) - 1
+        files = self.file_ids[row_ids].astype(np.int64) + 1
+        sections = self.section_ids[row_ids].astype(np.int64) + 1
+        pages = self.page_numbers[row_ids].astype(np.int64)
+        return (files << 42) | ((sections & mask) << 21) | (pages & mask)
+
+    def page_rows(self, filename: str) -> Dict[int, np.ndarray]:
+        """Row ids of a file grouped by page, pages in order of first appearance.
+
+        Built with one stable sort over the file's page column and cached until the
+        next add_documents, so per-page lookups never rescan the file's rows.
+        """
+        cached = self._page_rows_cache.get(filename)
+        if cached is not None:
+            return cached
+        rows = self._file_rows.get(filename)
+        if rows is None:
+            return {}
+        pages = self.page_numbers[rows]
+        order = np.argsort(pages, kind="stable")
+        uniq, starts = np.unique(pages[order], return_index=True)
+        groups = np.split(rows[order], starts[1:])
+        # order[starts] is each page's first row position, which restores appearance order
+        grouped = {int(uniq[j]): groups[j] for j in np.argsort(order[starts], kind="stable")}
+        self._page_rows_cache[filename] = grouped
+        return grouped
+
+    def rows_for(self, filename: str, page_number: Optional[int] = None) -> List[int]:
+        """Row ids (in insertion order) for a file, or one page of it."""
+        if page_number is not None:
+            rows = self.page_rows(filename).get(int(page_number))
+            return rows.tolist() if rows is not None else []
+        rows = self._file_rows.get(filename)
+        return rows.tolist() if rows is not None else []
+
+    def get_page_text(self, filename: str, page_number: Optional[int] = None, max_chars: int = 2000) -> str:
+        """Joined chunk text for one page (or the whole file when page_number is None).
+
+        Used as the query for filename-based recommendations. Rows come from a page mask
+        over the file's rows; repeat lookups come from a cache reset by add_documents.
+        """
+        key = (filename, page_number)
+        cached = self._page_text_cache.get(key)
+        if cached is not None:
+            return cached[:max_chars]
+        rows = self.rows_for(filename, page_number)
+        full = "\n\n".join(self.texts[i] for i in rows)
+        self._page_text_cache[key] = full
+        return full[:max_chars]
+
+    def search_ids(self, query_embedding: List[float] | np.ndarray, k: int = 5, fetch_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Like search(), but returns parallel (row_ids, scores) arrays, best first.
+
+        Callers that filter on the structure-of-arrays columns (file_ids, page_numbers,
+        section_ids) can mask these directly and only materialize the rows they keep.
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
         if self.index is None or self.index.ntotal == 0:
-            return []
+            return empty
         q = np.ascontiguousarray(np.array(query_embedding, dtype=np.float32))
         if q.ndim == 1:
             q = q[None, :]
         if self.dim is not None and q.shape[1] != self.dim:
             raise ValueError(f"Query embedding dimension mismatch: store={self.dim}, query={q.shape[1]}")
 
-        nprobe = fetch_k if fetch_k is not None else k
-        distances, indices = self.index.search(q, nprobe)
-        idxs = indices[0].tolist()
-        dists = distances[0].tolist()
+        index = self.index
+        if self.index_type == "hnsw" and index.ntotal < self.hnsw_exact_below:
+            # Small store: scan the graph's own flat (L2) storage exactly instead; same
+            # ids and distance metric, and cheaper than the graph walk at this size
+            index = faiss.downcast_index(self.index.storage)
+            nprobe = k
+        elif self.index_type == "hnsw":
+            # A wider fetch raises HNSW's effective efSearch, which helps recall
+            nprobe = max(k, fetch_k if fetch_k is not None else k)
+        else:
+            # Exact flat search: the top-k of a wider fetch is just the top-k
+            nprobe = k
+        # Asking FAISS for more than it holds only pads the result with -1 ids
+        nprobe = max(1, min(nprobe, index.ntotal))
+        distances, indices = index.search(q, nprobe)
+        ids = indices[0].astype(np.int64)
+        dists = distances[0]
+        valid = ids >= 0
+        ids = ids[valid][:k]
+        dists = dists[valid][:k]
+        if self.metric == "ip":
+            # inner product on normalized vectors ∈ [-1, 1]
+            scores = dists
+        else:
+            # HNSW L2 returns squared L2 distance on unit vectors.
+            # For unit vectors: a·b = 1 - 0.5*||a-b||^2
+            scores = 1.0 - 0.5 * dists
+        return ids, scores.astype(np.float32)
+
+    def search(self, query_embedding: List[float] | np.ndarray, k: int = 5, fetch_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search for the top-k most similar chunks given a query embedding.
 
+        Uses inner product on normalized vectors (i.e., cosine similarity).
+        Returns a list of dicts with: text, metadata, score, distance (1 - score)
+        """
+        ids, scores = self.search_ids(query_embedding, k=k, fetch_k=fetch_k)
         results: List[Dict[str, Any]] = []
-        for i, dist in zip(idxs, dists):
-            if i < 0:
-                continue
-            if self.metric == "ip":
-                # inner product on normalized vectors ∈ [-1, 1]
-                score = float(dist)
-                pseudo_distance = 1.0 - score
-            else:
-                # HNSW L2 returns squared L2 distance on unit vectors.
-                # For unit vectors: a·b = 1 - 0.5*||a-b||^2
-                score = 1.0 - 0.5 * float(dist)
-                pseudo_distance = 1.0 - score
+        for i, score in zip(ids.tolist(), scores.tolist()):
             results.append({
                 "text": self.texts[i],
                 "metadata": self.metadatas[i],
                 "score": score,
                 # Back-compat: pseudo-distance as (1 - score) for cosine
-                "distance": pseudo_distance,
+                "distance": 1.0 - score,
             })
-        # Trim to k in case fetch_k > k
-        return results[:k]
+        return results
@@ -24,8 +24,9 @@ export default function UploadPdfButton({ onUploaded }: Props) {
       })
       const filenames: string[] = res.data?.saved ?? []
       
-      // Step 2: Process each file (add to vector store)
-      for (const filename of filenames) {
+      // Step 2: Process the files concurrently (add to vector store); the server parses
+      // them on its worker pool, so one large PDF no longer holds up the rest
+      await Promise.all(filenames.map(async (filename) => {
         try {
           await axios.post(`${api}/process`, null, {
             params: { filename }
@@ -33,7 +34,7 @@ export default function UploadPdfButton({ onUploaded }: Props) {
         } catch (err) {
           console.warn(`Processing ${filename} failed:`, err)
         }
-      }
+      }))
       
       onUploaded?.(filenames)
     } catch (err) {